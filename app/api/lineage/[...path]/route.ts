@@ -0,0 +1,32 @@
+import { NextResponse } from 'next/server';
+
+export const revalidate = 0;
+
+// Proxies lineage lookups to the long-running Python service (backend/lineage_service.py).
+export async function GET(req: Request, { params }: { params: { path: string[] } }) {
+  const base = process.env.LINEAGE_SERVICE_URL;
+  if (!base) {
+    return NextResponse.json({ error: 'lineage_service_not_configured' }, { status: 503 });
+  }
+
+  const url = new URL(req.url);
+  const path = params.path.map((p) => encodeURIComponent(p)).join('/');
+  const target = `${base.replace(/\/$/, '')}/${path}${url.search}`;
+  const headers: Record<string, string> = {};
+  const ifNoneMatch = req.headers.get('if-none-match');
+  if (ifNoneMatch) headers['If-None-Match'] = ifNoneMatch;
+
+  try {
+    const res = await fetch(target, { headers, cache: 'no-store' });
+    const etag = res.headers.get('etag');
+    const outHeaders: Record<string, string> = { 'Cache-Control': 'no-cache' };
+    if (etag) outHeaders.ETag = etag;
+    if (res.status === 304) {
+      return new NextResponse(null, { status: 304, headers: outHeaders });
+    }
+    outHeaders['Content-Type'] = 'application/json';
+    return new NextResponse(await res.text(), { status: res.status, headers: outHeaders });
+  } catch (e: any) {
+    return NextResponse.json({ error: e?.message ?? 'lineage_service_unreachable' }, { status: 502 });
+  }
+}
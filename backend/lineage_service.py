@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+from typing import Dict, Any, List, Optional, Tuple
+
+# --- Configuration ---
+LINEAGE_HOST = os.getenv("LINEAGE_HOST", "127.0.0.1")
+LINEAGE_PORT = int(os.getenv("LINEAGE_PORT", "8765"))
+LINEAGE_CACHE_SIZE = int(os.getenv("LINEAGE_CACHE_SIZE", "2048"))
+DEFAULT_SNAPSHOT = os.path.join(os.path.dirname(__file__), "../public/graph_snapshot.json")
+
+MAX_HOPS = 6
+MAX_SEARCH_RESULTS = 100
+
+# --- 1. In-memory graph index ---
+
+class LineageIndex:
+    """Immutable, indexed view of one analyzed graph (the `get_graph()` shape).
+
+    A new index is built for every scan and swapped in whole, so readers never
+    see a half-updated graph and cached subgraphs die with the index they came from.
+    """
+
+    def __init__(self, graph: Dict[str, Any]):
+        elements = graph.get("elements", {})
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        for n in elements.get("nodes", []):
+            self.nodes.setdefault(n["data"]["id"], n)
+        self.edges: List[Dict[str, Any]] = elements.get("edges", [])
+        self.out_edges: Dict[str, List[int]] = {}
+        self.in_edges: Dict[str, List[int]] = {}
+        for i, e in enumerate(self.edges):
+            self.out_edges.setdefault(e["data"]["source"], []).append(i)
+            self.in_edges.setdefault(e["data"]["target"], []).append(i)
+        # lowercase search keys, built once per index
+        self.search_keys = [
+            (node_id, f"{node_id} {n['data'].get('label') or ''}".lower())
+            for node_id, n in self.nodes.items()
+        ]
+        body = json.dumps(graph, sort_keys=True).encode("utf-8")
+        self.version = hashlib.blake2b(body, digest_size=8).hexdigest()
+        self.loaded_at = time.time()
+        self.cache = LruCache(LINEAGE_CACHE_SIZE)
+
+    def node(self, node_id: str) -> Optional[Dict[str, Any]]:
+        return self.nodes.get(node_id)
+
+    def traverse(self, start: str, hops: int, direction: str) -> Dict[str, Any]:
+        """Breadth-first walk up to `hops` edges; direction is 'up', 'down' or 'both'."""
+        seen = {start}
+        edge_ids = set()
+        frontier = deque([(start, 0)])
+        while frontier:
+            node_id, depth = frontier.popleft()
+            if depth >= hops:
+                continue
+            steps = []
+            if direction in ("down", "both"):
+                steps += [(i, self.edges[i]["data"]["target"]) for i in self.out_edges.get(node_id, [])]
+            if direction in ("up", "both"):
+                steps += [(i, self.edges[i]["data"]["source"]) for i in self.in_edges.get(node_id, [])]
+            for i, nxt in steps:
+                edge_ids.add(i)
+                if nxt not in seen:
+                    seen.add(nxt)
+                    frontier.append((nxt, depth + 1))
+        return {
+            "elements": {
+                "nodes": [self.nodes[n] for n in seen if n in self.nodes],
+                "edges": [self.edges[i] for i in sorted(edge_ids)],
+            }
+        }
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        q = query.lower()
+        out = []
+        for node_id, key in self.search_keys:
+            if q in key:
+                out.append(self.nodes[node_id])
+                if len(out) >= limit:
+                    break
+        return out
+
+
+class LruCache:
+    """Small thread-safe LRU of serialized responses: key -> (etag, body)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[Any, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+            return hit
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+
+# --- 2. Graph loading / hot swap ---
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_scan() -> Dict[str, Any]:
+    """Run ingest + analysis in-process, the same way `ingest_analyzer.py` does."""
+    from ingest_analyzer import generate_mock_data, Analyzer
+
+    raw_data = generate_mock_data()
+    analyzer = Analyzer(raw_data)
+    analyzer.analyze()
+    return analyzer.get_graph()
+
+
+class LineageService:
+    def __init__(self, snapshot_path: Optional[str] = None, scan_interval: int = 0, poll_interval: float = 2.0):
+        self.snapshot_path = snapshot_path
+        self.scan_interval = scan_interval
+        self.poll_interval = poll_interval
+        self._snapshot_mtime = None
+        self.index = LineageIndex({"elements": {"nodes": [], "edges": []}})
+
+    def swap(self, graph: Dict[str, Any]):
+        # build fully before publishing; the attribute assignment is the swap
+        index = LineageIndex(graph)
+        self.index = index
+        print(f"Loaded graph {index.version}: {len(index.nodes)} nodes, {len(index.edges)} edges")
+
+    def reload_snapshot_if_changed(self):
+        if not self.snapshot_path:
+            return
+        try:
+            mtime = os.stat(self.snapshot_path).st_mtime
+        except OSError:
+            return
+        if mtime == self._snapshot_mtime:
+            return
+        try:
+            self.swap(load_snapshot(self.snapshot_path))
+            self._snapshot_mtime = mtime
+        except Exception as e:
+            # a half-written snapshot is retried on the next poll
+            print(f"Snapshot load failed: {e}")
+
+    def start_background(self):
+        if self.snapshot_path:
+            self.reload_snapshot_if_changed()
+            threading.Thread(target=self._watch_snapshot, daemon=True).start()
+        if self.scan_interval:
+            threading.Thread(target=self._scan_loop, daemon=True).start()
+
+    def _watch_snapshot(self):
+        while True:
+            time.sleep(self.poll_interval)
+            self.reload_snapshot_if_changed()
+
+    def _scan_loop(self):
+        while True:
+            try:
+                self.swap(run_scan())
+            except Exception as e:
+                print(f"Scan failed, keeping previous graph: {e}")
+            time.sleep(self.scan_interval)
+
+
+# --- 3. HTTP API ---
+
+def _int_param(params: Dict[str, List[str]], name: str, default: int, upper: int) -> int:
+    try:
+        value = int(params.get(name, [default])[0])
+    except ValueError:
+        value = default
+    return max(0, min(value, upper))
+
+
+def handle_request(index: LineageIndex, path: str, params: Dict[str, List[str]]) -> Tuple[int, Any]:
+    """Route a GET to a (status, payload) pair. Pure, so results can be cached per index."""
+    parts = [unquote(p) for p in path.strip("/").split("/") if p]
+    if parts == ["health"]:
+        return 200, {
+            "ok": True,
+            "version": index.version,
+            "loadedAt": index.loaded_at,
+            "nodes": len(index.nodes),
+            "edges": len(index.edges),
+        }
+    if parts == ["graph"]:
+        return 200, {"elements": {"nodes": list(index.nodes.values()), "edges": index.edges}}
+    if parts == ["search"]:
+        q = params.get("q", [""])[0]
+        if not q:
+            return 400, {"error": "missing_query"}
+        limit = _int_param(params, "limit", 25, MAX_SEARCH_RESULTS)
+        return 200, {"results": index.search(q, limit)}
+    if len(parts) in (2, 3) and parts[0] == "nodes":
+        node_id = parts[1]
+        node = index.node(node_id)
+        if node is None:
+            return 404, {"error": "not_found"}
+        if len(parts) == 2:
+            return 200, {
+                "node": node,
+                "upstream": [index.edges[i] for i in index.in_edges.get(node_id, [])],
+                "downstream": [index.edges[i] for i in index.out_edges.get(node_id, [])],
+            }
+        view = parts[2]
+        if view == "neighborhood":
+            return 200, index.traverse(node_id, _int_param(params, "k", 1, MAX_HOPS), "both")
+        if view == "upstream":
+            return 200, index.traverse(node_id, _int_param(params, "depth", MAX_HOPS, MAX_HOPS), "up")
+        if view == "downstream":
+            return 200, index.traverse(node_id, _int_param(params, "depth", MAX_HOPS, MAX_HOPS), "down")
+    return 404, {"error": "unknown_route"}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison: `*` or any listed tag equal to `etag` once `W/` is dropped."""
+    if not if_none_match:
+        return False
+    tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
+
+
+def make_handler(service: LineageService):
+    class LineageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # pin one index for the whole request so a concurrent swap can't mix versions
+            index = service.index
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            cache_key = (url.path, tuple(sorted((k, tuple(v)) for k, v in params.items())))
+            hit = None if url.path.rstrip("/") == "/health" else index.cache.get(cache_key)
+            if hit is None:
+                status, payload = handle_request(index, url.path, params)
+                body = json.dumps(payload).encode("utf-8")
+                etag = f'"{index.version}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                if status == 200:
+                    index.cache.put(cache_key, (etag, body))
+            else:
+                status = 200
+                etag, body = hit
+
+            if status == 200 and etag_matches(self.headers.get("If-None-Match"), etag):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return LineageHandler
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the latest lineage graph over HTTP")
+    parser.add_argument("--host", default=LINEAGE_HOST)
+    parser.add_argument("--port", type=int, default=LINEAGE_PORT)
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT, help="Graph snapshot to serve; reloaded whenever it changes")
+    parser.add_argument("--scan-interval", type=int, default=0, help="Also re-run ingest/analysis in-process every N seconds (0 = off)")
+    args = parser.parse_args()
+
+    service = LineageService(args.snapshot, scan_interval=args.scan_interval)
+    service.start_background()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Lineage service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
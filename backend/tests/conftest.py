@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend modules import each other as top-level modules (see lineage_service.run_scan)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
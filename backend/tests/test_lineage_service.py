@@ -0,0 +1,107 @@
+import http.client
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from lineage_service import LineageIndex, LineageService, etag_matches, handle_request, make_handler
+
+
+def node(node_id, label=None):
+    return {"data": {"id": node_id, "label": label or node_id}}
+
+
+def edge(source, target, label="READS_FROM"):
+    return {"data": {"id": f"{source}_{target}", "source": source, "target": target, "label": label}}
+
+
+# de::A -> query::Q -> de::B -> page::P, plus an unrelated de::C
+GRAPH = {
+    "elements": {
+        "nodes": [node("de::A", "Customers"), node("query::Q"), node("de::B", "Daily Customers"),
+                  node("page::P"), node("de::C")],
+        "edges": [edge("de::A", "query::Q"), edge("query::Q", "de::B", "WRITES_TO"), edge("de::B", "page::P")],
+    }
+}
+
+
+def ids(payload):
+    return sorted(n["data"]["id"] for n in payload["elements"]["nodes"])
+
+
+def test_routes():
+    index = LineageIndex(GRAPH)
+    status, health = handle_request(index, "/health", {})
+    assert status == 200 and health["nodes"] == 5 and health["edges"] == 3
+
+    status, detail = handle_request(index, "/nodes/query%3A%3AQ", {})
+    assert status == 200
+    assert [e["data"]["source"] for e in detail["upstream"]] == ["de::A"]
+    assert [e["data"]["target"] for e in detail["downstream"]] == ["de::B"]
+
+    status, found = handle_request(index, "/search", {"q": ["customers"]})
+    assert status == 200 and [n["data"]["id"] for n in found["results"]] == ["de::A", "de::B"]
+    assert handle_request(index, "/search", {})[0] == 400
+    assert handle_request(index, "/nodes/de::missing", {})[0] == 404
+    assert handle_request(index, "/nodes/de::A/sideways", {})[0] == 404
+
+
+def test_traversal():
+    index = LineageIndex(GRAPH)
+    assert ids(handle_request(index, "/nodes/de::B/neighborhood", {"k": ["1"]})[1]) == ["de::B", "page::P", "query::Q"]
+    assert ids(handle_request(index, "/nodes/de::B/neighborhood", {"k": ["2"]})[1]) == ["de::A", "de::B", "page::P", "query::Q"]
+    assert ids(handle_request(index, "/nodes/de::B/upstream", {})[1]) == ["de::A", "de::B", "query::Q"]
+    down = handle_request(index, "/nodes/de::A/downstream", {"depth": ["2"]})[1]
+    assert ids(down) == ["de::A", "de::B", "query::Q"]
+    assert len(down["elements"]["edges"]) == 2
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"v1-abc"', True),
+    ('W/"v1-abc"', True),
+    ('"other", "v1-abc"', True),
+    ("*", True),
+    ('"v1-abcd"', False),
+    ('"v1-ab"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"v1-abc"') is expected
+
+
+@pytest.fixture
+def server():
+    service = LineageService()
+    service.swap(GRAPH)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(service))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield service, httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(port, path, etag=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    return resp.status, resp.getheader("ETag"), body
+
+
+def test_conditional_get_and_swap_invalidation(server):
+    service, port = server
+    status, etag, body = get(port, "/nodes/de::A/downstream")
+    assert status == 200 and ids(json.loads(body)) == ["de::A", "de::B", "page::P", "query::Q"]
+    assert get(port, "/nodes/de::A/downstream", etag)[0] == 304
+    assert get(port, "/nodes/de::A/downstream", f'"stale", W/{etag}')[0] == 304
+    assert get(port, "/nodes/de::missing", "*")[0] == 404
+
+    changed = json.loads(json.dumps(GRAPH))
+    changed["elements"]["edges"].append(edge("de::A", "de::C"))
+    service.swap(changed)
+
+    status, new_etag, body = get(port, "/nodes/de::A/downstream", etag)
+    assert status == 200 and new_etag != etag
+    assert "de::C" in ids(json.loads(body))
@@ -0,0 +1 @@
+"""SFMC scanner package. Kept import-free so `python -m sfmc_scanner <command>` starts fast."""
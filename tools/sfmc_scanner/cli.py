@@ -0,0 +1,193 @@
+"""
+SFMC Scanner CLI
+- scan:    authenticate, fetch from SFMC (or replay an archive) and write graph.json + CSVs
+- analyze: re-run PII propagation over an existing graph.json
+- export:  write Neo4j CSVs or a UI snapshot from an existing graph.json
+- diff:    compare two graph.json files
+- impact:  list nodes downstream (or upstream) of a node
+
+Only `scan` needs requests/sqlparse/python-dotenv; everything is imported inside the
+subcommand that uses it so the offline commands start quickly.
+"""
+
+import argparse
+import os
+from typing import List, Optional
+
+
+def cmd_scan(args) -> int:
+    try:
+        import requests  # noqa: F401
+        import sqlparse  # noqa: F401
+        from dotenv import load_dotenv
+    except ImportError:
+        print('Missing dependencies. Run: pip install -r requirements.txt')
+        raise
+    # must run before the scanner module reads its config from the environment
+    load_dotenv()
+
+    from . import sfmc_scanner
+    from .response_archive import ResponseArchive
+
+    if args.verbose:
+        sfmc_scanner.VERBOSE_FLAG = True
+    archive = None
+    if args.record_archive:
+        archive = ResponseArchive(args.record_archive, 'record')
+    elif args.replay_archive:
+        try:
+            archive = ResponseArchive(args.replay_archive, 'replay')
+        except FileNotFoundError as e:
+            print(e)
+            return 2
+    sfmc_scanner.orchestrate(args.out, archive)
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    from .graph_model import CompactGraph, NodeType
+    from .sfmc_scanner import propagate_pii
+
+    graph = CompactGraph.load_json(args.graph)
+    de_fields = {}
+    for h in graph.node_handles():
+        if graph.node_type(h) == NodeType.DATA_EXTENSION:
+            de_fields[graph.ids[h]] = graph.node_dict(h).get('metadata', {}).get('fields', [])
+    out_dir = args.out or os.path.dirname(os.path.abspath(args.graph))
+    os.makedirs(out_dir, exist_ok=True)
+    propagate_pii(graph, de_fields, os.path.join(out_dir, 'pii_taint.json'))
+    out_json = os.path.join(out_dir, 'graph.json')
+    graph.write_json(out_json)
+    print(f'Wrote {out_json} ({graph.node_count} nodes, {graph.edge_count} edges)')
+    return 0
+
+
+def cmd_export(args) -> int:
+    from .graph_model import RELATIONSHIP_LABELS, CompactGraph
+
+    graph = CompactGraph.load_json(args.graph)
+    os.makedirs(args.out, exist_ok=True)
+    if args.format == 'csv':
+        nodes_csv = os.path.join(args.out, 'nodes.csv')
+        edges_csv = os.path.join(args.out, 'edges.csv')
+        graph.write_csv(nodes_csv, edges_csv)
+        print('Wrote', nodes_csv, edges_csv)
+    else:
+        import json
+
+        from .pii_taint import FLOW_DIRECTION
+
+        # the Cytoscape `elements` shape read by the lineage UI (public/graph_snapshot.json)
+        nodes = []
+        for n in graph.iter_node_dicts():
+            data = {'id': n['id'], 'label': n.get('name') or n['id'], 'type': n['type'], 'metadata': n.get('metadata', {})}
+            for key in ('piiLabels', 'sensitivityScore'):
+                if key in n:
+                    data[key] = n[key]
+            nodes.append({'data': data})
+        edges = []
+        for i in range(graph.edge_count):
+            src, dst, rel, conf, _ = graph.edge(i)
+            # the snapshot points edges along the data flow (READS_FROM runs DE -> Query),
+            # while graph.json keeps the scanner's query -> DE orientation
+            if FLOW_DIRECTION.get(rel) == -1:
+                src, dst = dst, src
+            source, target, label = graph.ids[src], graph.ids[dst], RELATIONSHIP_LABELS[rel].upper()
+            edges.append({'data': {'id': f'{source}_{label}_{target}', 'source': source, 'target': target,
+                                   'label': label, 'confidence': conf}})
+        snapshot = {'elements': {'nodes': nodes, 'edges': edges}}
+        out_json = os.path.join(args.out, 'graph_snapshot.json')
+        with open(out_json, 'w', encoding='utf-8') as fh:
+            json.dump(snapshot, fh, indent=2)
+        print('Wrote', out_json)
+    return 0
+
+
+def cmd_diff(args) -> int:
+    import json
+
+    def load(path):
+        with open(path, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        nodes = {n['id']: n for n in data.get('nodes', [])}
+        edges = {(e['from'], e['to'], e['relationship']) for e in data.get('edges', [])}
+        return nodes, edges
+
+    old_nodes, old_edges = load(args.old)
+    new_nodes, new_edges = load(args.new)
+    result = {
+        'addedNodes': sorted(new_nodes.keys() - old_nodes.keys()),
+        'removedNodes': sorted(old_nodes.keys() - new_nodes.keys()),
+        'changedNodes': sorted(k for k in new_nodes.keys() & old_nodes.keys() if new_nodes[k] != old_nodes[k]),
+        'addedEdges': sorted(new_edges - old_edges),
+        'removedEdges': sorted(old_edges - new_edges),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, items in result.items():
+            print(f'{key}: {len(items)}')
+            for item in items:
+                print('  ' + (' -> '.join(item) if isinstance(item, tuple) else item))
+    return 1 if args.exit_code and any(result.values()) else 0
+
+
+def cmd_impact(args) -> int:
+    from .graph_model import NODE_TYPE_LABELS, CompactGraph
+    from .pii_taint import TaintPropagator
+
+    graph = CompactGraph.load_json(args.graph)
+    h = graph.ids.lookup(args.node)
+    if h is None:
+        print(f'Unknown node: {args.node}')
+        return 2
+    flow = TaintPropagator(graph)
+    reached = flow.upstream([h]) if args.upstream else flow.downstream([h])
+    for r in reached[1:]:
+        label = NODE_TYPE_LABELS.get(graph.node_type(r), 'Undeclared')
+        print(f'{graph.ids[r]}\t{label}\t{graph.node_name(r) or ""}')
+    print(f'{len(reached) - 1} {"upstream" if args.upstream else "downstream"} node(s) of {args.node}')
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='sfmc_scanner', description='SFMC scanner: export and analyze DE lineage graphs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('scan', help='Scan SFMC (or replay an archive) and write graph.json + CSVs')
+    p.add_argument('--out', '--out-dir', dest='out', default='./output', help='Output directory for graph.json and CSVs')
+    p.add_argument('--verbose', dest='verbose', action='store_true', help='Write verbose SOAP/REST responses for debugging')
+    archive_group = p.add_mutually_exclusive_group()
+    archive_group.add_argument('--record-archive', dest='record_archive', help='Record every SOAP/REST response into this archive directory')
+    archive_group.add_argument('--replay-archive', dest='replay_archive', help='Re-run analysis from a recorded archive instead of the live API')
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser('analyze', help='Re-run PII propagation over an existing graph.json')
+    p.add_argument('graph', help='Path to graph.json')
+    p.add_argument('--out', help='Output directory (defaults to the graph\'s directory)')
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser('export', help='Export an existing graph.json')
+    p.add_argument('graph', help='Path to graph.json')
+    p.add_argument('--out', default='./output', help='Output directory')
+    p.add_argument('--format', choices=['csv', 'snapshot'], default='csv', help='Neo4j CSVs or the UI graph_snapshot.json')
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser('diff', help='Compare two graph.json files')
+    p.add_argument('old')
+    p.add_argument('new')
+    p.add_argument('--json', action='store_true', help='Print the diff as JSON')
+    p.add_argument('--exit-code', dest='exit_code', action='store_true', help='Exit 1 when the graphs differ')
+    p.set_defaults(func=cmd_diff)
+
+    p = sub.add_parser('impact', help='List nodes affected by (or feeding) a node')
+    p.add_argument('graph', help='Path to graph.json')
+    p.add_argument('node', help='Node id, e.g. de::MyKey')
+    p.add_argument('--upstream', action='store_true', help='Walk against the data flow instead')
+    p.set_defaults(func=cmd_impact)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,149 @@
+"""
+Content reference scanner
+- Finds DE references in AMPscript/SSJS across emails, content blocks, CloudPages and script activities
+- A str.find prefilter on function-name/dataevents anchors limits the regex to candidate positions
+- Variable assignments are only scanned when a reference passes a variable
+- Resolves names passed through variables (SET @de = 'X' ... Lookup(@de, ...) / var de = "X"; DataExtension.Init(de))
+- Extracts text from asset payloads without serializing the whole response
+
+Each reference is tagged 'read' or 'write' so writes can be linked as data flowing into the DE.
+"""
+
+import re
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+# AMPscript / SSJS functions that take a DE name as their first argument
+READ_FUNCTIONS = (
+    'LookupOrderedRowsCS', 'LookupOrderedRows', 'LookupRowsCS', 'LookupRows', 'Lookup',
+    'DataExtensionRowCount', 'DataExtension.Init', 'DataExtensionObject',
+)
+WRITE_FUNCTIONS = (
+    'InsertDE', 'UpdateDE', 'UpsertDE', 'DeleteDE',
+    'InsertData', 'UpdateData', 'UpsertData', 'DeleteData', 'ClaimRow',
+)
+
+# DataExtension.Init can be followed by reads or writes on the object; it is counted as a read
+_FUNCTION_KIND = {f.lower(): 'read' for f in READ_FUNCTIONS}
+_FUNCTION_KIND.update({f.lower(): 'write' for f in WRITE_FUNCTIONS})
+
+# longest names first so the alternation never stops at a prefix (LookupRows vs Lookup)
+_FN_ALT = '|'.join(re.escape(f) for f in sorted(READ_FUNCTIONS + WRITE_FUNCTIONS, key=len, reverse=True))
+
+_CALL_RE = re.compile(
+    r"""
+      \b(?P<fn>""" + _FN_ALT + r""")\s*\(\s*
+        (?:'(?P<sq>[^'\r\n]*)'|"(?P<dq>[^"\r\n]*)"|(?P<var>@?[A-Za-z_$][\w$]*))
+    | (?<=/hub/v1/)dataevents/key:(?P<key>[\w\-.]+)
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+_ASSIGN_RE = re.compile(
+    r"""
+      \bSET\s+(?P<avar>@\w+)\s*=\s*(?:'(?P<asq>[^'\r\n]*)'|"(?P<adq>[^"\r\n]*)")
+    | \b(?:var|let|const)\s+(?P<jvar>[A-Za-z_$][\w$]*)\s*=\s*(?:'(?P<jsq>[^'\r\n]*)'|"(?P<jdq>[^"\r\n]*)")
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# Literal prefilter: every match of a pattern starts with one of its anchors, so the regex is
+# only tried where str.find lands on the lowercased body instead of at every character.
+# All function names are at least six characters, so their six-letter prefixes cover them.
+_CALL_ANCHORS = tuple(sorted({f[:6].lower() for f in READ_FUNCTIONS + WRITE_FUNCTIONS})) + ('dataevents',)
+_ASSIGN_ANCHORS = ('set', 'var', 'let', 'const')
+
+# payload keys that carry markup/script; everything else (ids, dates, owners) is skipped
+_TEXT_KEYS = ('content', 'superContent', 'script', 'views', 'slots', 'blocks', 'html', 'text', 'preheader', 'subjectline')
+
+
+class ContentRef(NamedTuple):
+    name: str
+    kind: str  # 'read' | 'write'
+    via: str  # function name or 'dataevents'
+
+
+def _anchored_matches(pattern: re.Pattern, content: str, lowered: Optional[str], anchors) -> Iterator[re.Match]:
+    """Non-overlapping matches of `pattern`, in order, tried only at anchor positions."""
+    if lowered is None:
+        # lowercasing changed the length (rare non-ASCII), so positions would not line up
+        yield from pattern.finditer(content)
+        return
+    positions = set()
+    for a in anchors:
+        i = lowered.find(a)
+        while i != -1:
+            positions.add(i)
+            i = lowered.find(a, i + 1)
+    end = 0
+    for i in sorted(positions):
+        if i < end:
+            continue
+        m = pattern.match(content, i)
+        if m:
+            end = m.end()
+            yield m
+
+
+def scan_content(content: str) -> List[ContentRef]:
+    """Return unique DE references in `content`, in first-seen order."""
+    if not content:
+        return []
+    lowered = content.lower()
+    if len(lowered) != len(content):
+        lowered = None
+    pending = []
+    for m in _anchored_matches(_CALL_RE, content, lowered, _CALL_ANCHORS):
+        fn = m.group('fn')
+        if fn:
+            literal = m.group('sq') if m.group('sq') is not None else m.group('dq')
+            pending.append((literal, m.group('var'), fn))
+        else:
+            pending.append((m.group('key'), None, 'dataevents'))
+    if not pending:
+        return []
+
+    variables: Dict[str, str] = {}
+    if any(literal is None for literal, _, _ in pending):
+        for m in _anchored_matches(_ASSIGN_RE, content, lowered, _ASSIGN_ANCHORS):
+            if m.group('avar'):
+                variables[m.group('avar').lower()] = m.group('asq') if m.group('asq') is not None else m.group('adq')
+            else:
+                variables[m.group('jvar').lower()] = m.group('jsq') if m.group('jsq') is not None else m.group('jdq')
+
+    seen = set()
+    out: List[ContentRef] = []
+    for literal, var, fn in pending:
+        # variables are resolved against the last assignment anywhere in the body
+        name = literal if literal is not None else variables.get((var or '').lower())
+        if not name or not name.strip():
+            continue
+        kind = 'write' if fn == 'dataevents' else _FUNCTION_KIND[fn.lower()]
+        ref = ContentRef(name.strip(), kind, fn)
+        if (ref.name.lower(), kind) not in seen:
+            seen.add((ref.name.lower(), kind))
+            out.append(ref)
+    return out
+
+
+def asset_text(asset: Any) -> str:
+    """Concatenate the markup/script strings of an asset (content, views, slots, blocks...)."""
+    parts: List[str] = []
+    _collect_text(asset, parts)
+    return '\n'.join(parts)
+
+
+def _collect_text(value: Any, parts: List[str]):
+    if isinstance(value, str):
+        parts.append(value)
+    elif isinstance(value, dict):
+        for k in _TEXT_KEYS:
+            v = value.get(k)
+            if v:
+                _collect_text(v, parts)
+        # views/slots/blocks are keyed by arbitrary names
+        if 'content' not in value and 'superContent' not in value and 'script' not in value:
+            for k, v in value.items():
+                if k not in _TEXT_KEYS and isinstance(v, dict):
+                    _collect_text(v, parts)
+    elif isinstance(value, list):
+        for v in value:
+            _collect_text(v, parts)
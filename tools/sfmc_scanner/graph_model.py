@@ -0,0 +1,325 @@
+"""
+Compact lineage graph model
+- Node and edge IDs are interned once and referenced by integer handles
+- Node/edge tables are array-backed; types and relationships are enum-coded
+- Evidence lists are deduplicated into a shared table
+- Converted to the graph.json / nodes.csv / edges.csv shapes only at emit time
+
+Large accounts produce millions of edges that mostly repeat the same handful of
+strings ('reads_from', 'de::...' prefixes, identical evidence lists). Keeping
+them as per-edge dicts costs several GB; this model keeps one copy of each.
+"""
+
+import csv
+import json
+from array import array
+from enum import IntEnum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class NodeType(IntEnum):
+    UNDECLARED = 0  # referenced by an edge but never added as a node
+    DATA_EXTENSION = 1
+    QUERY = 2
+    AUTOMATION = 3
+    JOURNEY = 4
+    CLOUDPAGE = 5
+    ACTIVITY = 6  # non-query automation activity (import, extract, filter, script)
+    ASSET = 7  # Content Builder email/block that references a DE
+
+
+class Relationship(IntEnum):
+    READS_FROM = 0
+    WRITES_TO = 1
+    USED_BY = 2
+    REFERENCES = 3
+    EXECUTES = 4
+
+
+# emitted labels, kept identical to the previous dict-based graph.json
+NODE_TYPE_LABELS = {
+    NodeType.DATA_EXTENSION: 'DataExtension',
+    NodeType.QUERY: 'Query',
+    NodeType.AUTOMATION: 'Automation',
+    NodeType.JOURNEY: 'Journey',
+    NodeType.CLOUDPAGE: 'CloudPage',
+    NodeType.ACTIVITY: 'Activity',
+    NodeType.ASSET: 'Asset',
+}
+NODE_TYPE_BY_LABEL = {v: k for k, v in NODE_TYPE_LABELS.items()}
+
+RELATIONSHIP_LABELS = {
+    Relationship.READS_FROM: 'reads_from',
+    Relationship.WRITES_TO: 'writes_to',
+    Relationship.USED_BY: 'used_by',
+    Relationship.REFERENCES: 'references',
+    Relationship.EXECUTES: 'executes',
+}
+RELATIONSHIP_BY_LABEL = {v: k for k, v in RELATIONSHIP_LABELS.items()}
+
+_NO_NAME = -1
+
+
+class StringTable:
+    """Intern strings to dense integer handles (and back)."""
+
+    __slots__ = ('_index', '_strings')
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        h = self._index.get(value)
+        if h is None:
+            h = len(self._strings)
+            self._index[value] = h
+            self._strings.append(value)
+        return h
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+    def __getitem__(self, handle: int) -> str:
+        return self._strings[handle]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
+
+
+class CompactGraph:
+    """Array-backed lineage graph keyed by interned node IDs.
+
+    Node handles are shared between nodes and edge endpoints, so an edge may
+    point at an ID that was never declared as a node (e.g. ``unknown::X``);
+    such handles keep ``NodeType.UNDECLARED`` and are not emitted as nodes.
+    """
+
+    __slots__ = (
+        'ids', 'names', '_node_type', '_node_name', '_node_order', '_node_attrs',
+        '_edge_src', '_edge_dst', '_edge_rel', '_edge_conf', '_edge_ev',
+        '_evidence', '_evidence_index',
+    )
+
+    def __init__(self):
+        self.ids = StringTable()
+        self.names = StringTable()
+        # per-handle node columns
+        self._node_type = array('B')
+        self._node_name = array('i')
+        self._node_order = array('i')
+        # sparse extra properties (externalKey, metadata, sql, ...), only for nodes that carry them
+        self._node_attrs: Dict[int, Dict[str, Any]] = {}
+        # edge columns
+        self._edge_src = array('i')
+        self._edge_dst = array('i')
+        self._edge_rel = array('B')
+        self._edge_conf = array('d')
+        self._edge_ev = array('i')
+        # shared evidence lists
+        self._evidence: List[Tuple[str, ...]] = []
+        self._evidence_index: Dict[Tuple[str, ...], int] = {}
+
+    # -------------------------------
+    # Construction
+    # -------------------------------
+
+    def handle(self, node_id: str) -> int:
+        """Return the handle for ``node_id``, interning it if new."""
+        h = self.ids.intern(node_id)
+        if h == len(self._node_type):
+            self._node_type.append(NodeType.UNDECLARED)
+            self._node_name.append(_NO_NAME)
+        return h
+
+    def add_node(self, node_id: str, node_type, name: Optional[str] = None, **attrs) -> int:
+        """Declare a node. Re-adding an existing ID keeps the first declaration
+        and merges any new attributes into it."""
+        h = self.handle(node_id)
+        if self._node_type[h] == NodeType.UNDECLARED:
+            self._node_type[h] = _coerce(node_type, NodeType, NODE_TYPE_BY_LABEL)
+            self._node_name[h] = self.names.intern(name) if name is not None else _NO_NAME
+            self._node_order.append(h)
+        if attrs:
+            self._node_attrs.setdefault(h, {}).update(attrs)
+        return h
+
+    def update_node(self, h: int, **attrs):
+        """Merge extra properties into an already-declared node."""
+        if self._node_type[h] == NodeType.UNDECLARED:
+            raise KeyError(self.ids[h])
+        self._node_attrs.setdefault(h, {}).update(attrs)
+
+    def drop_node_attrs(self, h: int, *keys: str):
+        """Remove properties from a node; missing keys are ignored."""
+        attrs = self._node_attrs.get(h)
+        if attrs:
+            for k in keys:
+                attrs.pop(k, None)
+
+    def add_edge(self, src: str, dst: str, relationship, evidence: Iterable[str] = (), confidence: float = 0.0) -> int:
+        """Append an edge and return its index."""
+        self._edge_src.append(self.handle(src))
+        self._edge_dst.append(self.handle(dst))
+        self._edge_rel.append(_coerce(relationship, Relationship, RELATIONSHIP_BY_LABEL))
+        self._edge_conf.append(confidence)
+        self._edge_ev.append(self._intern_evidence(evidence))
+        return len(self._edge_src) - 1
+
+    def _intern_evidence(self, evidence: Iterable[str]) -> int:
+        key = tuple(evidence)
+        h = self._evidence_index.get(key)
+        if h is None:
+            h = len(self._evidence)
+            self._evidence_index[key] = h
+            self._evidence.append(key)
+        return h
+
+    # -------------------------------
+    # Lookup
+    # -------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return len(self._node_order)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_src)
+
+    def has_node(self, node_id: str) -> bool:
+        h = self.ids.lookup(node_id)
+        return h is not None and self._node_type[h] != NodeType.UNDECLARED
+
+    def node_type(self, h: int) -> NodeType:
+        return NodeType(self._node_type[h])
+
+    def node_name(self, h: int) -> Optional[str]:
+        n = self._node_name[h]
+        return self.names[n] if n != _NO_NAME else None
+
+    def node_handles(self) -> Iterator[int]:
+        return iter(self._node_order)
+
+    def edge(self, i: int) -> Tuple[int, int, Relationship, float, Tuple[str, ...]]:
+        return (self._edge_src[i], self._edge_dst[i], Relationship(self._edge_rel[i]),
+                self._edge_conf[i], self._evidence[self._edge_ev[i]])
+
+    # -------------------------------
+    # Emit
+    # -------------------------------
+
+    def node_dict(self, h: int) -> Dict[str, Any]:
+        node = {'id': self.ids[h], 'type': NODE_TYPE_LABELS[NodeType(self._node_type[h])], 'name': self.node_name(h)}
+        node.update(self._node_attrs.get(h, {}))
+        return node
+
+    def edge_dict(self, i: int) -> Dict[str, Any]:
+        src, dst, rel, conf, ev = self.edge(i)
+        return {
+            'from': self.ids[src],
+            'to': self.ids[dst],
+            'relationship': RELATIONSHIP_LABELS[rel],
+            'evidence': list(ev),
+            'confidence': conf,
+        }
+
+    def iter_node_dicts(self) -> Iterator[Dict[str, Any]]:
+        for h in self._node_order:
+            yield self.node_dict(h)
+
+    def iter_edge_dicts(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self._edge_src)):
+            yield self.edge_dict(i)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactGraph':
+        """Rebuild a graph from the graph.json shape written by `write_json`."""
+        graph = cls()
+        for n in data.get('nodes', []):
+            attrs = {k: v for k, v in n.items() if k not in ('id', 'type', 'name')}
+            graph.add_node(n['id'], n['type'], n.get('name'), **attrs)
+        for e in data.get('edges', []):
+            graph.add_edge(e['from'], e['to'], e['relationship'], e.get('evidence', []), e.get('confidence') or 0.0)
+        return graph
+
+    @classmethod
+    def load_json(cls, path: str) -> 'CompactGraph':
+        with open(path, 'r', encoding='utf-8') as fh:
+            return cls.from_dict(json.load(fh))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the legacy ``{'nodes': [...], 'edges': [...]}`` shape."""
+        return {'nodes': list(self.iter_node_dicts()), 'edges': list(self.iter_edge_dicts())}
+
+    def write_json(self, path: str):
+        """Stream graph.json; output matches ``json.dump(to_dict(), indent=2)``
+        without materializing the full dict."""
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write('{\n')
+            _write_json_array(fh, 'nodes', self.iter_node_dicts(), self.node_count)
+            fh.write(',\n')
+            _write_json_array(fh, 'edges', self.iter_edge_dicts(), self.edge_count)
+            fh.write('\n}')
+
+    def write_csv(self, nodes_csv: str, edges_csv: str):
+        """Write nodes.csv / edges.csv for Neo4j import."""
+        with open(nodes_csv, 'w', newline='', encoding='utf-8') as nf:
+            writer = csv.writer(nf)
+            writer.writerow(['id', 'type', 'name', 'externalKey', 'metadata'])
+            for h in self._node_order:
+                attrs = self._node_attrs.get(h, {})
+                writer.writerow([self.ids[h], NODE_TYPE_LABELS[NodeType(self._node_type[h])], self.node_name(h),
+                                 attrs.get('externalKey', ''), json.dumps(attrs.get('metadata', {}))])
+
+        with open(edges_csv, 'w', newline='', encoding='utf-8') as ef:
+            writer = csv.writer(ef)
+            writer.writerow(['from', 'to', 'relationship', 'evidence', 'confidence'])
+            # evidence is shared, so serialize each distinct list once
+            ev_json: Dict[int, str] = {}
+            for i in range(len(self._edge_src)):
+                ev = self._edge_ev[i]
+                if ev not in ev_json:
+                    ev_json[ev] = json.dumps(list(self._evidence[ev]))
+                writer.writerow([self.ids[self._edge_src[i]], self.ids[self._edge_dst[i]],
+                                 RELATIONSHIP_LABELS[Relationship(self._edge_rel[i])], ev_json[ev], self._edge_conf[i]])
+
+
+def _coerce(value, enum_cls, by_label: Dict[str, Any]):
+    if isinstance(value, enum_cls):
+        return value
+    try:
+        return by_label[value]
+    except KeyError:
+        raise ValueError(f'Unknown {enum_cls.__name__}: {value!r}') from None
+
+
+def build_csr(n: int, keys: array):
+    """Counting sort of edge indices by ``keys``; returns (offsets, order)."""
+    offsets = array('i', bytes(4 * (n + 1)))
+    for k in keys:
+        offsets[k + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    cursor = array('i', offsets)
+    order = array('i', bytes(4 * len(keys)))
+    for i, k in enumerate(keys):
+        order[cursor[k]] = i
+        cursor[k] += 1
+    return offsets, order
+
+
+def _write_json_array(fh, key: str, items: Iterable[Dict[str, Any]], count: int):
+    fh.write(f'  {json.dumps(key)}: [')
+    if not count:
+        fh.write(']')
+        return
+    first = True
+    for item in items:
+        fh.write('\n    ' if first else ',\n    ')
+        first = False
+        fh.write(json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n    '))
+    fh.write('\n  ]')
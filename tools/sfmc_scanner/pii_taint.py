@@ -0,0 +1,301 @@
+"""
+PII taint propagation
+- Seeds per-node PII label bitsets from field-level detection on DEs
+- Pushes labels along data-flow edges (reads_from / writes_to / used_by / references)
+- Handles cycles by condensing strongly connected components, then walks them in topological order
+- Re-propagates only the downstream cone of nodes whose seeds or inputs changed since the last scan
+
+Taint sets are stored as one 64-bit mask per node handle, so account-wide propagation
+stays a single pass over flat arrays.
+"""
+
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from .graph_model import CompactGraph, Relationship, build_csr
+
+# label bits
+EMAIL = 1 << 0
+PHONE = 1 << 1
+SSN = 1 << 2
+
+LABEL_NAMES = {EMAIL: 'Email', PHONE: 'Phone', SSN: 'SSN'}
+# same weights as src/lib/piiScanner.ts so scores line up with the dashboard
+LABEL_SENSITIVITY = {EMAIL: 50, PHONE: 40, SSN: 90}
+
+_REASON_LABELS = {
+    'email pattern': EMAIL,
+    'phone pattern': PHONE,
+    'ssn-like': SSN,
+    'type:emailaddress': EMAIL,
+    'type:phone': PHONE,
+}
+
+# which way data moves for each relationship: +1 follows the edge, -1 runs against it
+FLOW_DIRECTION = {
+    Relationship.READS_FROM: -1,  # query/page reads from DE: DE -> query
+    Relationship.WRITES_TO: 1,
+    Relationship.USED_BY: 1,
+    Relationship.REFERENCES: -1,
+}
+
+
+def labels_from_reasons(reasons: Iterable[str]) -> int:
+    """Map `detect_field_pii` reasons to a label mask."""
+    mask = 0
+    for r in reasons:
+        mask |= _REASON_LABELS.get(r.lower(), 0)
+    return mask
+
+
+def label_names(mask: int) -> List[str]:
+    return [name for bit, name in LABEL_NAMES.items() if mask & bit]
+
+
+def sensitivity_score(mask: int) -> int:
+    return min(100, sum(w for bit, w in LABEL_SENSITIVITY.items() if mask & bit))
+
+
+class TaintPropagator:
+    """Propagates PII label masks over a `CompactGraph`'s data-flow edges."""
+
+    def __init__(self, graph: CompactGraph):
+        self.graph = graph
+        n = len(graph.ids)
+        self.n = n
+        src = array('i')
+        dst = array('i')
+        for i in range(graph.edge_count):
+            s, d, rel, _, _ = graph.edge(i)
+            direction = FLOW_DIRECTION.get(rel)
+            if direction == 1:
+                src.append(s)
+                dst.append(d)
+            elif direction == -1:
+                src.append(d)
+                dst.append(s)
+        self._flow_src = src
+        self._flow_dst = dst
+        self._succ_off, order = build_csr(n, src)
+        self._succ = array('i', (dst[i] for i in order))
+        self._pred_off, order = build_csr(n, dst)
+        self._pred = array('i', (src[i] for i in order))
+        self.seeds = array('Q', bytes(8 * n))
+        self.taint = array('Q', bytes(8 * n))
+
+    def set_seed(self, node_id: str, mask: int):
+        h = self.graph.ids.lookup(node_id)
+        if h is not None:
+            self.seeds[h] = mask
+
+    def predecessors(self, h: int) -> array:
+        return self._pred[self._pred_off[h]:self._pred_off[h + 1]]
+
+    def successors(self, h: int) -> array:
+        return self._succ[self._succ_off[h]:self._succ_off[h + 1]]
+
+    # -------------------------------
+    # Propagation
+    # -------------------------------
+
+    def propagate(self, changed: Optional[Iterable[int]] = None) -> int:
+        """Recompute taint for `changed` handles and everything downstream of them
+        (all nodes when `changed` is None). Returns the number of nodes recomputed.
+
+        Nodes outside the cone keep their current taint and act as fixed inputs.
+        """
+        if changed is None:
+            in_cone = bytearray(b'\x01') * self.n
+            cone = range(self.n)
+        else:
+            in_cone, cone = self._downstream_cone(changed)
+
+        seeds, taint = self.seeds, self.taint
+        for comp in self._sccs_topological(cone, in_cone):
+            members = set(comp) if len(comp) > 1 else None
+            mask = 0
+            for v in comp:
+                mask |= seeds[v]
+                for p in self.predecessors(v):
+                    # inputs from inside the component (including self-loops) are stale until it is rewritten
+                    if p != v and (members is None or p not in members):
+                        mask |= taint[p]
+            for v in comp:
+                taint[v] = mask
+        return len(cone)
+
+    def _downstream_cone(self, changed: Iterable[int]):
+        return self._cone(changed, self._succ_off, self._succ)
+
+    def _cone(self, start: Iterable[int], offsets: array, adj: array):
+        in_cone = bytearray(self.n)
+        cone = []
+        stack = []
+        for h in start:
+            if not in_cone[h]:
+                in_cone[h] = 1
+                cone.append(h)
+                stack.append(h)
+        while stack:
+            v = stack.pop()
+            for w in adj[offsets[v]:offsets[v + 1]]:
+                if not in_cone[w]:
+                    in_cone[w] = 1
+                    cone.append(w)
+                    stack.append(w)
+        return in_cone, cone
+
+    def downstream(self, handles: Iterable[int]) -> List[int]:
+        """Handles reachable along data flow from `handles` (inclusive)."""
+        return self._cone(handles, self._succ_off, self._succ)[1]
+
+    def upstream(self, handles: Iterable[int]) -> List[int]:
+        """Handles whose data flows into `handles` (inclusive)."""
+        return self._cone(handles, self._pred_off, self._pred)[1]
+
+    def _sccs_topological(self, nodes: Iterable[int], in_cone: bytearray) -> List[List[int]]:
+        """Iterative Tarjan restricted to `in_cone`; SCCs returned upstream-first."""
+        index = array('i', [-1]) * self.n
+        low = array('i', bytes(4 * self.n))
+        on_stack = bytearray(self.n)
+        stack: List[int] = []
+        sccs: List[List[int]] = []
+        counter = 0
+        for root in nodes:
+            if index[root] != -1:
+                continue
+            work = [(root, self._succ_off[root])]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            while work:
+                v, pos = work[-1]
+                end = self._succ_off[v + 1]
+                while pos < end:
+                    w = self._succ[pos]
+                    pos += 1
+                    if not in_cone[w]:
+                        continue
+                    if index[w] == -1:
+                        work[-1] = (v, pos)
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append((w, self._succ_off[w]))
+                        break
+                    if on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        if low[v] < low[u]:
+                            low[u] = low[v]
+                    if low[v] == index[v]:
+                        comp = []
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = 0
+                            comp.append(w)
+                            if w == v:
+                                break
+                        sccs.append(comp)
+        # Tarjan emits sinks first
+        sccs.reverse()
+        return sccs
+
+    # -------------------------------
+    # Incremental recompute across scans
+    # -------------------------------
+
+    def propagate_incremental(self, previous: Dict[str, Any]) -> int:
+        """Reuse taint from a previous scan's `state()`; only nodes whose seed changed, that are
+        new, or that gained/lost a flow edge (plus their downstream cone) are recomputed.
+
+        Rescans usually intern nodes and edges in the same order, so the common case is a few
+        list comparisons; a handle remap plus edge-set diff is only needed when the order moved.
+        """
+        if not previous or 'ids' not in previous:
+            return self.propagate()
+        n = self.n
+        seeds = self.seeds
+        if previous['ids'] == list(self.graph.ids):
+            self.taint = array('Q', previous['taint'])
+            changed = {h for h, (a, b) in enumerate(zip(previous['seeds'], seeds)) if a != b}
+            if previous['src'] != self._flow_src.tolist() or previous['dst'] != self._flow_dst.tolist():
+                changed.update(self._edge_diff(range(n), previous))
+            return self.propagate(changed)
+
+        lookup = self.graph.ids.lookup
+        # previous handle -> current handle (-1 when the node is gone)
+        remap = [h if h is not None else -1 for h in map(lookup, previous['ids'])]
+        known = bytearray(n)
+        changed = set()
+        taint = self.taint
+        for old, h in enumerate(remap):
+            if h < 0:
+                continue
+            known[h] = 1
+            if previous['seeds'][old] != seeds[h]:
+                changed.add(h)
+            else:
+                taint[h] = previous['taint'][old]
+        changed.update(h for h in range(n) if not known[h])
+        changed.update(self._edge_diff(remap, previous))
+        return self.propagate(changed)
+
+    def _edge_diff(self, remap, previous: Dict[str, Any]) -> set:
+        """Targets of flow edges that appeared or disappeared since `previous`."""
+        n = self.n
+        current_edges = {s * n + d for s, d in zip(self._flow_src, self._flow_dst)}
+        previous_edges = set()
+        targets = set()
+        for s, d in zip(previous['src'], previous['dst']):
+            s, d = remap[s], remap[d]
+            if s >= 0 and d >= 0:
+                previous_edges.add(s * n + d)
+            elif d >= 0:
+                # source node was removed
+                targets.add(d)
+        targets.update(e % n for e in current_edges ^ previous_edges)
+        return targets
+
+    def state(self) -> Dict[str, Any]:
+        """Flat, handle-indexed snapshot for the next `propagate_incremental`."""
+        return {
+            'ids': list(self.graph.ids),
+            'seeds': self.seeds.tolist(),
+            'taint': self.taint.tolist(),
+            'src': self._flow_src.tolist(),
+            'dst': self._flow_dst.tolist(),
+        }
+
+    def annotate(self):
+        """Attach `piiLabels`/`sensitivityScore` to declared nodes that carry any taint and
+        clear them from the rest (a reloaded graph.json may carry labels from an earlier run)."""
+        g = self.graph
+        for h in g.node_handles():
+            mask = self.taint[h]
+            if mask:
+                g.update_node(h, piiLabels=label_names(mask), sensitivityScore=sensitivity_score(mask))
+            else:
+                g.drop_node_attrs(h, 'piiLabels', 'sensitivityScore')
+
+
+def load_state(path: str) -> Dict[str, Any]:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except Exception:
+        return {}
+
+
+def save_state(path: str, state: Dict[str, Any]):
+    with open(path, 'w', encoding='utf-8') as fh:
+        json.dump(state, fh)
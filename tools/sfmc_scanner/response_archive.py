@@ -0,0 +1,161 @@
+"""
+Raw-response archive
+- Record mode stores every SOAP/REST response body zlib-compressed in append-only segment files
+- Bodies are content-addressed (sha256), so identical responses are stored once
+- index.jsonl maps a normalized request key to (segment, offset, length, status)
+- Replay mode serves responses from memory-mapped segments with no network access
+
+Request keys drop the host and any OAuth token, so an archive recorded against one
+tenant URL/token can be replayed regardless of the credentials in the environment.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+INDEX_FILE = 'index.jsonl'
+
+_FUELOAUTH_RE = re.compile(rb'<fueloauth[^>]*>.*?</fueloauth>', re.DOTALL)
+
+
+class ArchiveMiss(KeyError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, body: bytes = b'') -> str:
+    parts = urlsplit(url)
+    key = f"{method.upper()} {parts.path}"
+    query = parts.query
+    if params:
+        query = '&'.join(q for q in (query, urlencode(sorted(params.items()))) if q)
+    if query:
+        key += f"?{query}"
+    if body:
+        body = _FUELOAUTH_RE.sub(b'', body)
+        key += f" body:{hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+class ArchivedResponse:
+    """Just enough of `requests.Response` for the scanner's HTTP helpers."""
+
+    def __init__(self, status_code: int, content: bytes, url: str = ''):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f'{self.status_code} Error (archived) for url: {self.url}')
+
+
+class ResponseArchive:
+    def __init__(self, root: str, mode: str = 'record'):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'Unknown archive mode: {mode}')
+        self.root = root
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._blobs: Dict[str, Dict[str, Any]] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._files = []
+        if mode == 'record':
+            os.makedirs(root, exist_ok=True)
+        elif not os.path.exists(os.path.join(root, INDEX_FILE)):
+            # replaying nothing would "succeed" with an empty graph and overwrite the outputs
+            raise FileNotFoundError(f'No response archive at {root} (missing {INDEX_FILE})')
+        self._load_index()
+        self._segment = max((e['segment'] for e in self._blobs.values()), default=0)
+        self._index_fh = open(os.path.join(root, INDEX_FILE), 'a', encoding='utf-8') if mode == 'record' else None
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _load_index(self):
+        path = os.path.join(self.root, INDEX_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                # later recordings of the same request win
+                self._index[entry['key']] = entry
+                self._blobs.setdefault(entry['digest'], entry)
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.root, f'{segment:05d}.seg')
+
+    # -------------------------------
+    # Record
+    # -------------------------------
+
+    def record(self, key: str, status_code: int, content: bytes):
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            loc = self._blobs.get(digest)
+            if loc is None:
+                blob = zlib.compress(content, 6)
+                path = self._segment_path(self._segment)
+                if os.path.exists(path) and os.path.getsize(path) + len(blob) > SEGMENT_MAX_BYTES:
+                    self._segment += 1
+                    path = self._segment_path(self._segment)
+                with open(path, 'ab') as fh:
+                    offset = fh.tell()
+                    fh.write(blob)
+                loc = {'digest': digest, 'segment': self._segment, 'offset': offset, 'length': len(blob)}
+                self._blobs[digest] = loc
+            entry = {'key': key, 'status': status_code, 'digest': digest,
+                     'segment': loc['segment'], 'offset': loc['offset'], 'length': loc['length']}
+            self._index[key] = entry
+            self._index_fh.write(json.dumps(entry) + '\n')
+            self._index_fh.flush()
+
+    # -------------------------------
+    # Replay
+    # -------------------------------
+
+    def _map(self, segment: int) -> mmap.mmap:
+        m = self._maps.get(segment)
+        if m is None:
+            fh = open(self._segment_path(segment), 'rb')
+            m = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._files.append(fh)
+            self._maps[segment] = m
+        return m
+
+    def lookup(self, key: str, url: str = '') -> ArchivedResponse:
+        entry = self._index.get(key)
+        if entry is None:
+            raise ArchiveMiss(key)
+        with self._lock:
+            m = self._map(entry['segment'])
+        content = zlib.decompress(m[entry['offset']:entry['offset'] + entry['length']])
+        return ArchivedResponse(entry['status'], content, url)
+
+    def close(self):
+        if self._index_fh:
+            self._index_fh.close()
+        for m in self._maps.values():
+            m.close()
+        for fh in self._files:
+            fh.close()
+        self._maps.clear()
+        self._files.clear()
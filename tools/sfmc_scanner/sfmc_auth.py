@@ -1,5 +1,4 @@
 import time
-import requests
 from typing import Dict, Any, Optional
 
 
@@ -20,6 +19,8 @@ def get_oauth_token(client_id: str, client_secret: str, auth_base_url: str, time
     if not client_id or not client_secret or not auth_base_url:
         raise ValueError('client_id, client_secret and auth_base_url are required')
 
+    import requests
+
     token_url = auth_base_url.rstrip('/') + '/v2/token'
     payload = {
         'grant_type': 'client_credentials',
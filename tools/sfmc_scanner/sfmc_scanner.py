@@ -3,7 +3,7 @@
 SFMC Scanner
 - Authenticate (OAuth)
 - Retrieve Data Extensions and fields
-- Retrieve Query Definitions, Automations, Journeys, CloudPages
+- Retrieve Query Definitions, Automations, Journeys, content assets (emails, blocks, CloudPages) and script activities
 - Parse SQL and build graph JSON (nodes/edges)
 - Detect PII via heuristics
 - Export graph.json and nodes/edges CSV for Neo4j
@@ -15,19 +15,15 @@ import os
 import sys
 import json
 import re
-import argparse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-try:
-    import requests
-    import sqlparse
-    from dotenv import load_dotenv
-except Exception:
-    print("Missing dependencies. Run: pip install -r requirements.txt")
-    raise
+if __package__ in (None, ''):
+    # run as a plain script: make the package importable so relative imports resolve
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = 'sfmc_scanner'
 
-# Load .env if present
-load_dotenv()
+# requests/sqlparse are imported where they are used so that commands which only work on an
+# existing graph.json never pay for them. .env is loaded by the CLI before this module is imported.
 
 # Config from env
 SFMC_CLIENT_ID = os.getenv('SFMC_CLIENT_ID', '')
@@ -36,6 +32,10 @@ SFMC_AUTH_BASE_URL = os.getenv('SFMC_AUTH_BASE_URL', '')
 SFMC_REST_BASE_URL = os.getenv('SFMC_REST_BASE_URL', '')
 SFMC_SOAP_BASE_URL = os.getenv('SFMC_SOAP_BASE_URL', '')
 ACCOUNT_ID = os.getenv('ACCOUNT_ID', '')
+AUTOMATION_DETAIL_WORKERS = int(os.getenv('AUTOMATION_DETAIL_WORKERS', '8'))
+
+# Content Builder asset types published as CloudPages
+CLOUDPAGE_ASSET_TYPES = ('webpage', 'templatebasedwebpage', 'landingpage', 'jscoderesource')
 
 # Simple PII regexes
 PII_REGEXES = {
@@ -54,12 +54,36 @@ FROM_RE = re.compile(r"\b(from|join|into)\s+([\[\]\\w\.\-]+)", re.IGNORECASE)
 # SFMC API helpers (delegated to sfmc_auth module)
 # -------------------------------
 from .sfmc_auth import get_cached_oauth_token as get_oauth_token
+from .graph_model import CompactGraph, NodeType, Relationship
+from .pii_taint import TaintPropagator, labels_from_reasons, load_state, save_state
+from .content_refs import ContentRef, asset_text, scan_content
+from .response_archive import ArchiveMiss, ArchivedResponse, ResponseArchive, request_key
+
+# set by orchestrate(); records responses or serves them back with no network
+HTTP_ARCHIVE: Optional[ResponseArchive] = None
+
+
+def http_request(method: str, url: str, params: dict = None, data: bytes = None, **kwargs):
+    """Single choke point for SOAP/REST calls so they can be archived or replayed."""
+    archive = HTTP_ARCHIVE
+    key = request_key(method, url, params, data or b'') if archive else ''
+    if archive and archive.replaying:
+        try:
+            return archive.lookup(key, url)
+        except ArchiveMiss:
+            return ArchivedResponse(404, b'', url)
+    import requests
+
+    r = requests.request(method, url, params=params, data=data, **kwargs)
+    if archive:
+        archive.record(key, r.status_code, r.content)
+    return r
 
 
 def rest_get(path: str, token: str, rest_base: str, params: dict = None) -> Any:
     url = rest_base.rstrip('/') + '/' + path.lstrip('/')
     headers = {'Authorization': f'Bearer {token}'}
-    r = requests.get(url, headers=headers, params=params)
+    r = http_request('GET', url, params=params, headers=headers)
     try:
         r.raise_for_status()
     except Exception:
@@ -82,6 +106,62 @@ def fetch_automations(token: str, rest_base: str) -> List[Dict[str, Any]]:
         return []
 
 
+def fetch_automation_details(token: str, rest_base: str, automations: List[Dict[str, Any]], cache_path: str = '', max_workers: int = AUTOMATION_DETAIL_WORKERS) -> List[Dict[str, Any]]:
+    """Resolve full automation definitions (steps/activities) from the detail endpoint.
+
+    The list endpoint usually omits activities. Details are fetched concurrently with at most
+    `max_workers` requests in flight and cached on disk keyed by automation id + modifiedDate,
+    so unchanged automations are not re-fetched on the next scan.
+    """
+    cache: Dict[str, Any] = {}
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as fh:
+                cache = json.load(fh)
+        except Exception:
+            cache = {}
+
+    def version(a: Dict[str, Any]) -> str:
+        return str(a.get('modifiedDate') or a.get('lastSavedDate') or '')
+
+    out: List[Dict[str, Any]] = list(automations)
+    pending = []
+    for i, a in enumerate(automations):
+        aid = a.get('id') or a.get('automationId') or a.get('objectId')
+        if not aid or a.get('steps') or a.get('activities'):
+            continue
+        hit = cache.get(str(aid))
+        if hit and version(a) and hit.get('modifiedDate') == version(a):
+            out[i] = hit['detail']
+        else:
+            pending.append((i, str(aid)))
+
+    def fetch(aid: str):
+        try:
+            return rest_get(f'/automation/v1/automations/{aid}', token, rest_base)
+        except Exception:
+            return None
+
+    if pending:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for (i, aid), detail in zip(pending, pool.map(fetch, [aid for _, aid in pending])):
+                if not isinstance(detail, dict) or detail.get('_http_error'):
+                    continue
+                merged = {**automations[i], **detail}
+                out[i] = merged
+                cache[aid] = {'modifiedDate': version(automations[i]), 'detail': merged}
+
+    if cache_path and pending:
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as fh:
+                json.dump(cache, fh)
+        except Exception:
+            pass
+    return out
+
+
 def fetch_journeys(token: str, rest_base: str) -> List[Dict[str, Any]]:
     """Fetch Journey Builder interactions (best-effort)."""
     try:
@@ -93,41 +173,55 @@ def fetch_journeys(token: str, rest_base: str) -> List[Dict[str, Any]]:
         return []
 
 
-def fetch_cloudpages(token: str, rest_base: str) -> List[Dict[str, Any]]:
-    """Fetch CloudPage assets (assets endpoint) and return published HTML assets.
-    This is a best-effort: it returns assets and their content when available.
-    """
-    out = []
-    try:
-        resp = rest_get('/asset/v1/content/assets', token, rest_base, params={'page': 1, 'pageSize': 50})
-        items = []
-        if isinstance(resp, dict):
-            items = resp.get('items') or resp.get('assets') or []
-        elif isinstance(resp, list):
-            items = resp
-        for it in items:
-            # only include HTML type assets (CloudPages)
-            if it.get('contentType') in ('templatebased', 'htmlemail', 'webpage', 'webpageasset') or it.get('assetType') == 'webpage':
-                out.append(it)
-    except Exception:
-        pass
-    return out
+def iter_paged(path: str, token: str, rest_base: str, page_size: int = 500, items_key: str = 'items'):
+    """Yield items from a paged REST collection, fetching the next page while the current one is processed."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(page: int):
+        try:
+            return rest_get(path, token, rest_base, params={'page': page, 'pageSize': page_size})
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        page = 1
+        seen = 0
+        nxt = pool.submit(fetch, page)
+        while True:
+            resp = nxt.result()
+            if isinstance(resp, dict):
+                items = resp.get(items_key) or []
+            else:
+                items = resp if isinstance(resp, list) else []
+            if not items:
+                return
+            seen += len(items)
+            # the API may cap pageSize below what was asked, so a short page is not the end;
+            # trust `count` when present, otherwise stop on the first empty page
+            count = resp.get('count') if isinstance(resp, dict) else None
+            more = count is None or seen < int(count)
+            if more:
+                page += 1
+                nxt = pool.submit(fetch, page)
+            yield from items
+            if not more:
+                return
+
+
+def asset_type_name(asset: Dict[str, Any]) -> str:
+    at = asset.get('assetType')
+    if isinstance(at, dict):
+        return (at.get('name') or '').lower()
+    return (at or asset.get('contentType') or '').lower()
+
+
+def is_cloudpage(asset: Dict[str, Any]) -> bool:
+    return asset_type_name(asset) in CLOUDPAGE_ASSET_TYPES or asset.get('contentType') in ('webpage', 'webpageasset')
 
 
 def parse_cloudpage_for_des(content: str) -> List[str]:
-    """Scan CloudPage HTML/SSJS/AMPscript for DE references (simple heuristics)."""
-    tokens = set()
-    if not content:
-        return []
-    # AMPscript Lookup, LookupRows, UpsertDE, DataExtension.Init patterns
-    patterns = [r"Lookup\(\s*'([^']+)'", r"LookupRows\(\s*'([^']+)'", r"UpsertData\(\s*'([^']+)'", r"DataExtension\.Init\(\s*'([^']+)'", r"DataExtensionObject\(\s*'([^']+)'"]
-    for p in patterns:
-        for m in re.findall(p, content, flags=re.IGNORECASE):
-            tokens.add(m.strip())
-    # also look for usages in JS that reference /hub/v1/dataevents/key:KEY
-    for m in re.findall(r"/hub/v1/dataevents/key:([\w\-_.]+)", content, flags=re.IGNORECASE):
-        tokens.add(m.strip())
-    return list(tokens)
+    """Scan CloudPage HTML/SSJS/AMPscript for DE references (names/keys, reads and writes)."""
+    return list(dict.fromkeys(ref.name for ref in scan_content(content)))
 
 
 def compute_confidence(evidence: List[str]) -> float:
@@ -172,7 +266,7 @@ def soap_retrieve(soap_base: str, token: str, object_type: str, properties: List
   </s:Body>
 </s:Envelope>'''
     headers = {'Content-Type': 'text/xml'}
-    r = requests.post(soap_url, data=envelope.encode('utf-8'), headers=headers, timeout=30)
+    r = http_request('POST', soap_url, data=envelope.encode('utf-8'), headers=headers, timeout=30)
     if verbose:
         # dump raw soap for inspection
         try:
@@ -210,6 +304,8 @@ def soap_retrieve(soap_base: str, token: str, object_type: str, properties: List
 # -------------------------------
 
 def extract_table_tokens(sql_text: str) -> List[str]:
+    import sqlparse
+
     # remove comments and quoted literals using sqlparse
     try:
         formatted = sqlparse.format(sql_text, strip_comments=True)
@@ -247,73 +343,231 @@ def detect_field_pii(field_name: str, field_type: str = '') -> Dict[str, Any]:
 # Graph builder
 # -------------------------------
 
-def build_graph(known_des: List[Dict[str, Any]], queries: List[Dict[str, Any]]) -> Dict[str, Any]:
-    nodes = []
-    edges = []
+def query_node_id(q: Dict[str, Any]) -> str:
+    qid = q.get('id') or q.get('queryDefinitionId') or q.get('CustomerKey') or str(q.get('ObjectID') or q.get('ObjectID'))
+    return f"query::{qid}"
+
+
+def query_target_key(q: Dict[str, Any]) -> str:
+    target = q.get('DataExtensionTarget')
+    if isinstance(target, dict):
+        return target.get('CustomerKey') or ''
+    return q.get('targetKey') or q.get('DataExtensionTarget.CustomerKey') or ''
+
+
+def index_des(known_des: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Lowercased DE name and key -> DE; first DE wins on collisions."""
+    de_index: Dict[str, Dict[str, Any]] = {}
+    for de in known_des:
+        for k in (de.get('Name'), de.get('CustomerKey')):
+            if k:
+                de_index.setdefault(k.lower(), de)
+    return de_index
+
+
+def build_graph(known_des: List[Dict[str, Any]], queries: List[Dict[str, Any]]) -> CompactGraph:
+    graph = CompactGraph()
 
     # Create DE nodes
     for de in known_des:
-        node = {
-            'id': f"de::{de.get('CustomerKey') or de.get('CustomerKey')}",
-            'type': 'DataExtension',
-            'name': de.get('Name') or de.get('CustomerKey'),
-            'externalKey': de.get('CustomerKey'),
-            'accountId': ACCOUNT_ID,
-            'metadata': {
+        graph.add_node(
+            f"de::{de.get('CustomerKey')}",
+            NodeType.DATA_EXTENSION,
+            de.get('Name') or de.get('CustomerKey'),
+            externalKey=de.get('CustomerKey'),
+            accountId=ACCOUNT_ID,
+            metadata={
                 'fields': de.get('fields', []),
-            }
-        }
-        nodes.append(node)
+            },
+        )
 
     # Query nodes and edges
+    de_index = index_des(known_des)
     for q in queries:
-        qid = q.get('id') or q.get('CustomerKey') or str(q.get('ObjectID') or q.get('ObjectID'))
-        qnode = {
-            'id': f"query::{qid}",
-            'type': 'Query',
-            'name': q.get('name') or q.get('Name') or f"Query {qid}",
-            'sql': q.get('queryText') or q.get('QueryText') or q.get('SQL'),
-        }
-        nodes.append(qnode)
-        sql_text = qnode['sql'] or ''
-        tokens = extract_table_tokens(sql_text)
+        qnode_id = query_node_id(q)
+        qid = qnode_id.split('::', 1)[1]
+        sql_text = q.get('queryText') or q.get('QueryText') or q.get('SQL')
+        graph.add_node(qnode_id, NodeType.QUERY, q.get('name') or q.get('Name') or f"Query {qid}", sql=sql_text)
+        tokens = extract_table_tokens(sql_text or '')
         for t in tokens:
-            normalized = t.lower()
-            matched = None
-            for de in known_des:
-                if (de.get('Name') and de.get('Name').lower() == normalized) or (de.get('CustomerKey') and de.get('CustomerKey').lower() == normalized):
-                    matched = de
-                    break
+            matched = de_index.get(t.lower())
             if matched:
-                edges.append({
-                    'from': qnode['id'],
-                    'to': f"de::{matched.get('CustomerKey')}",
-                    'relationship': 'reads_from',
-                    'evidence': [f"Query:{qid} reference"],
-                    'confidence': 0.9
-                })
+                graph.add_edge(qnode_id, f"de::{matched.get('CustomerKey')}", Relationship.READS_FROM,
+                               [f"Query:{qid} reference"], 0.9)
             else:
-                edges.append({
-                    'from': qnode['id'],
-                    'to': f"unknown::{t}",
-                    'relationship': 'reads_from',
-                    'evidence': [f"SQL token:{t}"],
-                    'confidence': 0.4
-                })
+                graph.add_edge(qnode_id, f"unknown::{t}", Relationship.READS_FROM,
+                               [f"SQL token:{t}"], 0.4)
+        target_key = query_target_key(q)
+        if target_key:
+            graph.add_edge(qnode_id, f"de::{target_key}", Relationship.WRITES_TO,
+                           [f"Query:{qid} target"], 1.0)
 
-    return {'nodes': nodes, 'edges': edges}
+    return graph
+
+
+# -------------------------------
+# Automation enrichment
+# -------------------------------
+
+# Automation Studio activity objectTypeId -> activity kind
+ACTIVITY_OBJECT_TYPES = {
+    300: 'query',
+    43: 'import',
+    73: 'extract',
+    303: 'filter',
+    423: 'script',
+}
+
+
+def iter_automation_activities(automation: Dict[str, Any]):
+    """Yield activities from a detail (`steps[].activities`) or list-shaped automation."""
+    for step in automation.get('steps') or []:
+        for act in step.get('activities') or []:
+            yield act
+    for act in automation.get('activities') or automation.get('Activities') or automation.get('activity') or []:
+        yield act
+
+
+def enrich_automations(graph: CompactGraph, automations: List[Dict[str, Any]], queries: List[Dict[str, Any]]):
+    """Add automation nodes plus `executes` edges to the activities they run and `writes_to`
+    edges to the DEs those activities target (directly or through a query's target DE)."""
+    # index queries by every identifier an activity may carry
+    query_index: Dict[str, Dict[str, Any]] = {}
+    for q in queries:
+        for k in (q.get('queryDefinitionId'), q.get('id'), q.get('ObjectID'), q.get('key'), q.get('CustomerKey')):
+            if k:
+                query_index.setdefault(str(k).lower(), q)
+
+    for a in automations:
+        aid = a.get('id') or a.get('automationId') or a.get('objectId')
+        anode_id = f"automation::{aid}"
+        graph.add_node(anode_id, NodeType.AUTOMATION, a.get('name') or a.get('Name'))
+        for act in iter_automation_activities(a):
+            if not isinstance(act, dict):
+                continue
+            label = act.get('activityType') or act.get('type') or act.get('name') or ''
+            obj_id = act.get('activityObjectId')
+            try:
+                kind = ACTIVITY_OBJECT_TYPES.get(int(act.get('objectTypeId')))
+            except (TypeError, ValueError):
+                kind = None
+            targets = [t.get('key') or t.get('customerKey') for t in act.get('targetDataExtensions') or [] if isinstance(t, dict)]
+
+            q = query_index.get(str(obj_id).lower()) if obj_id else None
+            if q is not None:
+                qnode_id = query_node_id(q)
+                ev = [f"Automation:{aid} activity:{label} query:{obj_id}"]
+                graph.add_edge(anode_id, qnode_id, Relationship.EXECUTES, ev, compute_confidence(ev))
+                targets.append(query_target_key(q))
+            elif obj_id and kind:
+                act_node_id = f"{kind}::{obj_id}"
+                if kind == 'query':
+                    # query not in the fetched definitions: keep it a Query so query:: ids stay Query-typed
+                    graph.add_node(act_node_id, NodeType.QUERY, act.get('name') or f"Query {obj_id}")
+                else:
+                    graph.add_node(act_node_id, NodeType.ACTIVITY, act.get('name') or str(obj_id), activityType=kind)
+                ev = [f"Automation:{aid} activity:{label} asset id:{obj_id}"]
+                graph.add_edge(anode_id, act_node_id, Relationship.EXECUTES, ev, compute_confidence(ev))
+
+            # list-shaped payloads sometimes carry the destination inline
+            targets.append((act.get('arguments') or {}).get('to') or (act.get('configuration') or {}).get('destination')
+                           or act.get('dataExtensionCustomerKey'))
+            for target in dict.fromkeys(t for t in targets if t):
+                ev = [f"Automation:{aid} activity:{label}"]
+                graph.add_edge(anode_id, f"de::{target}", Relationship.WRITES_TO, ev, compute_confidence(ev))
+
+
+def propagate_pii(graph: CompactGraph, de_fields: Dict[str, List[Dict[str, Any]]], state_path: str = '') -> int:
+    """Seed PII labels from DE fields, propagate them downstream and annotate the graph.
+    Returns the number of nodes recomputed (only the changed cone when `state_path` holds a previous run)."""
+    taint = TaintPropagator(graph)
+    for node_id, fields in de_fields.items():
+        mask = 0
+        for f in fields or []:
+            mask |= labels_from_reasons(detect_field_pii(f.get('name') or '', f.get('type') or '')['reasons'])
+        if mask:
+            taint.set_seed(node_id, mask)
+    recomputed = taint.propagate_incremental(load_state(state_path))
+    if state_path:
+        save_state(state_path, taint.state())
+    taint.annotate()
+    print(f'PII taint recomputed for {recomputed} of {taint.n} nodes.')
+    return recomputed
+
+
+def link_content_refs(graph: CompactGraph, node_id: str, label: str, lang: str, refs: List[ContentRef],
+                      de_index: Dict[str, Dict[str, Any]]) -> int:
+    """Add `references` (reads) / `writes_to` (writes) edges from a content node to the DEs it names."""
+    for ref in refs:
+        de = de_index.get(ref.name.lower())
+        target = de.get('CustomerKey') if de else ref.name
+        ev = [f"{label} {lang}:{ref.via} token:{ref.name}"]
+        rel = Relationship.WRITES_TO if ref.kind == 'write' else Relationship.REFERENCES
+        graph.add_edge(node_id, f"de::{target}", rel, ev, compute_confidence(ev))
+    return len(refs)
+
+
+def scan_content_assets(graph: CompactGraph, token: str, rest_base: str, de_index: Dict[str, Dict[str, Any]]):
+    """Stream every Content Builder asset and SSJS script activity through the content scanner."""
+    assets = scripts = refs = 0
+    for asset in iter_paged('/asset/v1/content/assets', token, rest_base):
+        assets += 1
+        aid = asset.get('id') or asset.get('assetId')
+        content = asset_text(asset)
+        if is_cloudpage(asset):
+            node_id, node_type, label = f"cloudpage::{aid}", NodeType.CLOUDPAGE, f"CloudPage:{aid}"
+            if not content and aid:
+                # page bodies are not always in the list payload
+                try:
+                    detail = rest_get(f'/asset/v1/content/assets/{aid}', token, rest_base)
+                    content = asset_text(detail) if isinstance(detail, dict) else ''
+                except Exception:
+                    content = ''
+        else:
+            node_id, node_type, label = f"asset::{aid}", NodeType.ASSET, f"Asset:{aid}"
+        if node_type == NodeType.CLOUDPAGE:
+            graph.add_node(node_id, node_type, asset.get('name') or asset.get('displayName'))
+        found = scan_content(content)
+        if not found:
+            continue
+        if node_type == NodeType.ASSET:
+            # only assets that touch DEs become nodes; most emails/blocks do not
+            graph.add_node(node_id, node_type, asset.get('name'), assetType=asset_type_name(asset))
+        refs += link_content_refs(graph, node_id, label, 'ampscript', found, de_index)
+
+    for script in iter_paged('/automation/v1/scripts', token, rest_base):
+        scripts += 1
+        sid = script.get('ssjsActivityId') or script.get('id') or script.get('key')
+        node_id = f"script::{sid}"
+        graph.add_node(node_id, NodeType.ACTIVITY, script.get('name') or str(sid), activityType='script')
+        refs += link_content_refs(graph, node_id, f"Script:{sid}", 'ssjs', scan_content(script.get('script') or ''), de_index)
+    print(f'Scanned {assets} content assets and {scripts} script activities; found {refs} DE references.')
 
 
 # -------------------------------
 # Main orchestration
 # -------------------------------
 
-def orchestrate(out_dir: str):
+def orchestrate(out_dir: str, archive: Optional[ResponseArchive] = None):
+    global HTTP_ARCHIVE
     os.makedirs(out_dir, exist_ok=True)
     verbose = bool(globals().get('VERBOSE_FLAG', False))
+    HTTP_ARCHIVE = archive
+    try:
+        _orchestrate(out_dir, verbose)
+    finally:
+        HTTP_ARCHIVE = None
+        if archive:
+            archive.close()
+
 
-    print('Authenticating to SFMC...')
-    token_resp = get_oauth_token(SFMC_CLIENT_ID, SFMC_CLIENT_SECRET, SFMC_AUTH_BASE_URL)
+def _orchestrate(out_dir: str, verbose: bool):
+    if HTTP_ARCHIVE and HTTP_ARCHIVE.replaying:
+        print(f'Replaying responses from {HTTP_ARCHIVE.root} (no network)...')
+        token_resp = 'replay'
+    else:
+        print('Authenticating to SFMC...')
+        token_resp = get_oauth_token(SFMC_CLIENT_ID, SFMC_CLIENT_SECRET, SFMC_AUTH_BASE_URL)
     # get_oauth_token may return either a token string (cached helper) or a dict
     if isinstance(token_resp, dict):
         access_token = token_resp.get('access_token') or token_resp.get('accessToken')
@@ -351,13 +605,14 @@ def orchestrate(out_dir: str):
 
     print(f'Found {len(des)} DEs and {len(queries)} queries (best-effort).')
 
-    # Fetch automations, journeys, and cloudpages
-    print('Fetching Automations, Journeys, and CloudPages (REST)...')
+    # Fetch automations and journeys; content assets are streamed during enrichment
+    print('Fetching Automations and Journeys (REST)...')
     automations = fetch_automations(access_token, SFMC_REST_BASE_URL)
+    automations = fetch_automation_details(access_token, SFMC_REST_BASE_URL, automations,
+                                           cache_path=os.path.join(out_dir, 'automation_details.json'))
     journeys = fetch_journeys(access_token, SFMC_REST_BASE_URL)
-    cloudpages = fetch_cloudpages(access_token, SFMC_REST_BASE_URL)
 
-    print(f'Found {len(automations)} automations, {len(journeys)} journeys, {len(cloudpages)} cloudpages (best-effort).')
+    print(f'Found {len(automations)} automations, {len(journeys)} journeys (best-effort).')
     # For each DE, try to fetch fields (SOAP DataExtensionField)
     print('Fetching DE fields (SOAP, per-DE, up to limits)...')
     for de in des:
@@ -375,29 +630,13 @@ def orchestrate(out_dir: str):
 
     graph = build_graph(des, queries)
 
-    # Enrich graph with automations, journeys, and cloudpages
-    for a in automations:
-        aid = a.get('id') or a.get('automationId') or a.get('objectId')
-        anode = {'id': f"automation::{aid}", 'type': 'Automation', 'name': a.get('name') or a.get('Name')}
-        graph['nodes'].append(anode)
-        # inspect activities in automation if available
-        acts = a.get('activities') or a.get('activity') or []
-        for act in acts:
-            # if activity references a query or DE
-            label = act.get('activityType') or act.get('type') or ''
-            # look for target DE in payload
-            target = None
-            if isinstance(act, dict):
-                target = act.get('arguments', {}).get('to') or act.get('configuration', {}).get('destination') or act.get('dataExtensionCustomerKey')
-            if target:
-                ev = [f"Automation:{aid} activity:{label}"]
-                conf = compute_confidence(ev)
-                graph['edges'].append({'from': anode['id'], 'to': f"de::{target}", 'relationship': 'writes_to', 'evidence': ev, 'confidence': conf})
+    # Enrich graph with automations, journeys, and content
+    enrich_automations(graph, automations, queries)
 
     for j in journeys:
         jid = j.get('id') or j.get('interactionKey') or j.get('definitionId')
-        jnode = {'id': f"journey::{jid}", 'type': 'Journey', 'name': j.get('name') or j.get('displayName')}
-        graph['nodes'].append(jnode)
+        jnode_id = f"journey::{jid}"
+        graph.add_node(jnode_id, NodeType.JOURNEY, j.get('name') or j.get('displayName'))
         # try to find entry sources referencing DE
         entry = j.get('entryEvent') or j.get('entrySource') or j.get('entry')
         if isinstance(entry, dict):
@@ -405,61 +644,31 @@ def orchestrate(out_dir: str):
             if de_ref:
                 ev = [f"Journey:{jid} entry"]
                 conf = compute_confidence(ev)
-                graph['edges'].append({'from': f"de::{de_ref}", 'to': jnode['id'], 'relationship': 'used_by', 'evidence': ev, 'confidence': conf})
-
-    for cp in cloudpages:
-        cid = cp.get('id') or cp.get('assetId') or cp.get('id')
-        cpnode = {'id': f"cloudpage::{cid}", 'type': 'CloudPage', 'name': cp.get('name') or cp.get('displayName')}
-        graph['nodes'].append(cpnode)
-        # try to fetch content if available (asset content endpoint)
-        content = ''
-        try:
-            asset_id = cp.get('id') or cp.get('assetId')
-            if asset_id:
-                aresp = rest_get(f'/asset/v1/content/assets/{asset_id}', access_token, SFMC_REST_BASE_URL)
-                # asset content may be nested; try some fields
-                content = aresp.get('content') or aresp.get('html') or json.dumps(aresp)
-        except Exception:
-            content = ''
-        tokens = parse_cloudpage_for_des(content)
-        for t in tokens:
-            ev = [f"CloudPage:{cid} token:{t}"]
-            conf = compute_confidence(ev)
-            graph['edges'].append({'from': cpnode['id'], 'to': f"de::{t}", 'relationship': 'references', 'evidence': ev, 'confidence': conf})
+                graph.add_edge(f"de::{de_ref}", jnode_id, Relationship.USED_BY, ev, conf)
 
+    print('Scanning content assets, CloudPages and script activities (REST)...')
+    scan_content_assets(graph, access_token, SFMC_REST_BASE_URL, index_des(des))
+
+    # Propagate field-level PII downstream; only the cone affected since the last scan is recomputed
+    de_fields = {f"de::{de.get('CustomerKey')}": de.get('fields', []) for de in des}
+    propagate_pii(graph, de_fields, os.path.join(out_dir, 'pii_taint.json'))
+
+    # convert the compact graph to the JSON/CSV shapes only here, streaming record by record
     out_json = os.path.join(out_dir, 'graph.json')
-    with open(out_json, 'w', encoding='utf-8') as fh:
-        json.dump(graph, fh, ensure_ascii=False, indent=2)
+    graph.write_json(out_json)
     print('Wrote', out_json)
 
     # produce simple CSV for Neo4j import (nodes.csv, edges.csv)
-    import csv
     nodes_csv = os.path.join(out_dir, 'nodes.csv')
     edges_csv = os.path.join(out_dir, 'edges.csv')
-
-    with open(nodes_csv, 'w', newline='', encoding='utf-8') as nf:
-        writer = csv.writer(nf)
-        writer.writerow(['id', 'type', 'name', 'externalKey', 'metadata'])
-        for n in graph['nodes']:
-            writer.writerow([n.get('id'), n.get('type'), n.get('name'), n.get('externalKey', ''), json.dumps(n.get('metadata', {}))])
-
-    with open(edges_csv, 'w', newline='', encoding='utf-8') as ef:
-        writer = csv.writer(ef)
-        writer.writerow(['from', 'to', 'relationship', 'evidence', 'confidence'])
-        for e in graph['edges']:
-            writer.writerow([e.get('from'), e.get('to'), e.get('relationship'), json.dumps(e.get('evidence', [])), e.get('confidence', '')])
+    graph.write_csv(nodes_csv, edges_csv)
 
     print('Wrote', nodes_csv, edges_csv)
     print('Done.')
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser(description='SFMC scanner: export DE lineage graph')
-    parser.add_argument('--out', '--out-dir', dest='out', default='./output', help='Output directory for graph.json and CSVs')
-    parser.add_argument('--verbose', dest='verbose', action='store_true', help='Write verbose SOAP/REST responses for debugging')
-    args = parser.parse_args()
-    # pass verbose flag to orchestrate via global var set (quick pattern)
-    if args.verbose:
-        # set a module-level flag by monkeypatching local symbol (simple approach)
-        globals()['VERBOSE_FLAG'] = True
-    orchestrate(args.out)
+    # legacy entry point: `python sfmc_scanner.py --out ./output` == `python -m sfmc_scanner scan --out ./output`
+    from .cli import main
+
+    sys.exit(main(['scan'] + sys.argv[1:]))
@@ -0,0 +1,98 @@
+"""
+Content scanner benchmark (not collected by pytest)
+- Realistic corpus: 200 email/CloudPage-style HTML documents (~10 MB) with inline CSS, tracking
+  scripts and prose, a quarter of them carrying AMPscript/SSJS DE references
+- Random corpus: the same volume of random printable text
+- Compares scan_content against the original six re.findall heuristics it replaced
+
+Run from tools/: python -m sfmc_scanner.tests.bench_content_refs
+"""
+
+import random
+import re
+import string
+import time
+
+from sfmc_scanner.content_refs import scan_content
+
+DOCS = 200
+DOC_BYTES = 54 * 1024
+
+_PROSE = ('Update your preferences to keep hearing from us. You can delete your account settings or insert a '
+          'new address at any time. Lookup our store hours, then set a reminder. ')
+_MARKUP = (
+    '<table role="presentation" cellpadding="0" cellspacing="0" width="100%" style="border-collapse:collapse;'
+    'mso-table-lspace:0pt;mso-table-rspace:0pt"><tr><td class="content" style="padding:12px 24px;font-family:'
+    'Arial,sans-serif;font-size:14px;line-height:20px;color:#333333" valign="top"><a href="https://example.com/'
+    'offers?utm_source=email&amp;utm_medium=newsletter" target="_blank">{prose}</a></td></tr></table>\n'
+)
+_STYLE = '<style>.content{padding:0;margin:0}@media only screen and (max-width:600px){.col{width:100%!important}}</style>\n'
+_SCRIPT = ('<script>var offset = 0; let resetTimer = null; const charset = "utf-8"; function updateBanner(el){'
+           'el.classList.toggle("active"); offset += el.offsetHeight;}</script>\n')
+_AMPSCRIPT = (
+    "%%[ SET @subs = 'Subscribers_Master' SET @rows = LookupRows(@subs, 'Email', emailaddr) "
+    "UpsertData('Preference_Log', 1, 'Email', emailaddr, 'Pref', @pref) ]%%\n"
+    '<script runat="server">Platform.Load("core","1"); var de = DataExtension.Init("Web_Events");'
+    'de.Rows.Add({ts: Now()});</script>\n'
+    '<script>fetch("/hub/v1/dataevents/key:Form_Submits/rowset", {method: "POST"});</script>\n'
+)
+
+
+def realistic_corpus(seed: int = 7):
+    rnd = random.Random(seed)
+    docs = []
+    for i in range(DOCS):
+        parts = ['<!DOCTYPE html><html><head>', _STYLE, _SCRIPT, '</head><body>']
+        if i % 4 == 0:
+            parts.append(_AMPSCRIPT)
+        size = sum(map(len, parts))
+        while size < DOC_BYTES:
+            block = _MARKUP.format(prose=_PROSE * rnd.randint(1, 3))
+            parts.append(block)
+            size += len(block)
+        parts.append('</body></html>')
+        docs.append(''.join(parts))
+    return docs
+
+
+def random_corpus(seed: int = 7):
+    rnd = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + string.punctuation + ' \n'
+    return [''.join(rnd.choices(alphabet, k=DOC_BYTES)) for _ in range(DOCS)]
+
+
+def baseline_scan(content: str):
+    """The original parse_cloudpage_for_des heuristics."""
+    tokens = set()
+    if not content:
+        return []
+    patterns = [r"Lookup\(\s*'([^']+)'", r"LookupRows\(\s*'([^']+)'", r"UpsertData\(\s*'([^']+)'",
+                r"DataExtension\.Init\(\s*'([^']+)'", r"DataExtensionObject\(\s*'([^']+)'"]
+    for p in patterns:
+        for m in re.findall(p, content, flags=re.IGNORECASE):
+            tokens.add(m.strip())
+    for m in re.findall(r"/hub/v1/dataevents/key:([\w\-_.]+)", content, flags=re.IGNORECASE):
+        tokens.add(m.strip())
+    return list(tokens)
+
+
+def best_of(fn, docs, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for d in docs:
+            fn(d)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    for label, docs in (('realistic HTML', realistic_corpus()), ('random text', random_corpus())):
+        mb = sum(map(len, docs)) / 1e6
+        old = best_of(baseline_scan, docs)
+        new = best_of(scan_content, docs)
+        print(f'{label:15s} {len(docs)} docs, {mb:.1f} MB: baseline {old:.3f}s  scan_content {new:.3f}s  ({old / new:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# make `sfmc_scanner` importable as a package when pytest runs from the repo root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -0,0 +1,100 @@
+import json
+import os
+import subprocess
+import sys
+
+from sfmc_scanner import cli
+
+TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# generous for CI noise; the offline CLI imports only argparse/os/typing at startup
+IMPORT_BUDGET_SECONDS = 0.25
+
+
+def test_import_skips_scan_dependencies():
+    probe = (
+        'import sys, time\n'
+        't = time.perf_counter()\n'
+        'import sfmc_scanner.cli\n'
+        'elapsed = time.perf_counter() - t\n'
+        'print(elapsed)\n'
+        'print(",".join(m for m in ("requests", "sqlparse", "dotenv") if m in sys.modules))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', probe], cwd=TOOLS_DIR, capture_output=True, text=True, check=True)
+    elapsed, loaded = out.stdout.splitlines()
+    assert loaded == ''
+    assert float(elapsed) < IMPORT_BUDGET_SECONDS
+
+
+def test_analyze_clears_stale_pii_labels(tmp_path):
+    graph = {
+        'nodes': [
+            {'id': 'de::Clean', 'type': 'DataExtension', 'name': 'Clean',
+             'metadata': {'fields': [{'name': 'OrderId', 'type': 'Number'}]},
+             'piiLabels': ['Email'], 'sensitivityScore': 50},
+            {'id': 'query::q1', 'type': 'Query', 'name': 'q1', 'piiLabels': ['Email'], 'sensitivityScore': 50},
+        ],
+        'edges': [{'from': 'query::q1', 'to': 'de::Clean', 'relationship': 'reads_from', 'evidence': [], 'confidence': 1.0}],
+    }
+    path = tmp_path / 'graph.json'
+    path.write_text(json.dumps(graph), encoding='utf-8')
+    out_dir = tmp_path / 'out'
+
+    assert cli.main(['analyze', str(path), '--out', str(out_dir)]) == 0
+    nodes = json.loads((out_dir / 'graph.json').read_text(encoding='utf-8'))['nodes']
+    for node in nodes:
+        assert 'piiLabels' not in node and 'sensitivityScore' not in node
+
+
+def write_graph(tmp_path, graph):
+    path = tmp_path / 'graph.json'
+    path.write_text(json.dumps(graph), encoding='utf-8')
+    return str(path)
+
+
+SCANNED = {
+    'nodes': [
+        {'id': 'de::Subs', 'type': 'DataExtension', 'name': 'Subs', 'piiLabels': ['Email'], 'sensitivityScore': 50},
+        {'id': 'de::Daily', 'type': 'DataExtension', 'name': 'Daily', 'piiLabels': ['Email'], 'sensitivityScore': 50},
+        {'id': 'query::q1', 'type': 'Query', 'name': 'q1', 'piiLabels': ['Email'], 'sensitivityScore': 50},
+        {'id': 'cloudpage::7', 'type': 'CloudPage', 'name': 'Landing'},
+        {'id': 'automation::a1', 'type': 'Automation', 'name': 'Nightly'},
+    ],
+    'edges': [
+        {'from': 'query::q1', 'to': 'de::Subs', 'relationship': 'reads_from', 'evidence': [], 'confidence': 0.9},
+        {'from': 'query::q1', 'to': 'de::Daily', 'relationship': 'writes_to', 'evidence': [], 'confidence': 1.0},
+        {'from': 'automation::a1', 'to': 'query::q1', 'relationship': 'executes', 'evidence': [], 'confidence': 0.2},
+        {'from': 'cloudpage::7', 'to': 'de::Daily', 'relationship': 'references', 'evidence': [], 'confidence': 0.1},
+    ],
+}
+
+
+def edge_shapes(snapshot):
+    types = {n['data']['id']: n['data']['type'] for n in snapshot['elements']['nodes']}
+    return {(e['data']['label'], types[e['data']['source']], types[e['data']['target']])
+            for e in snapshot['elements']['edges']}
+
+
+def test_snapshot_export_follows_ui_snapshot_direction(tmp_path):
+    out_dir = tmp_path / 'out'
+    assert cli.main(['export', write_graph(tmp_path, SCANNED), '--out', str(out_dir), '--format', 'snapshot']) == 0
+    snapshot = json.loads((out_dir / 'graph_snapshot.json').read_text(encoding='utf-8'))
+
+    with open(os.path.join(TOOLS_DIR, '..', 'public', 'graph_snapshot.json'), encoding='utf-8') as fh:
+        ui_shapes = edge_shapes(json.load(fh))
+    exported = edge_shapes(snapshot)
+    # every relationship the UI snapshot also uses is oriented the same way
+    assert {s for s in exported if s[0] in {u[0] for u in ui_shapes}} <= ui_shapes
+    assert ('REFERENCES', 'DataExtension', 'CloudPage') in exported
+
+    edge = next(e['data'] for e in snapshot['elements']['edges'] if e['data']['label'] == 'READS_FROM')
+    assert edge['id'] == 'de::Subs_READS_FROM_query::q1'
+    query = next(n['data'] for n in snapshot['elements']['nodes'] if n['data']['id'] == 'query::q1')
+    assert query['piiLabels'] == ['Email'] and query['sensitivityScore'] == 50
+
+
+def test_impact_prints_emitted_type_labels(tmp_path, capsys):
+    assert cli.main(['impact', write_graph(tmp_path, SCANNED), 'de::Subs']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines[:-1]) == ['cloudpage::7\tCloudPage\tLanding', 'de::Daily\tDataExtension\tDaily', 'query::q1\tQuery\tq1']
+    assert lines[-1] == '3 downstream node(s) of de::Subs'
@@ -0,0 +1,28 @@
+from sfmc_scanner.content_refs import ContentRef, scan_content
+
+
+def test_functions_variables_and_dataevents():
+    body = (
+        "%%[ SET @de = 'Subscribers' SET @rows = LookupRows(@de, 'Email', @e) UpsertData(\"Log\", 1) ]%%\n"
+        '<script runat="server">var t = "Target"; var d = DataExtension.Init(t); Platform.Function.InsertDE("Ins")</script>\n'
+        '<script>fetch("/hub/v1/dataevents/key:Form_Submits/rowset")</script>'
+    )
+    assert scan_content(body) == [
+        ContentRef('Subscribers', 'read', 'LookupRows'),
+        ContentRef('Log', 'write', 'UpsertData'),
+        ContentRef('Target', 'read', 'DataExtension.Init'),
+        ContentRef('Ins', 'write', 'InsertDE'),
+        ContentRef('Form_Submits', 'write', 'dataevents'),
+    ]
+
+
+def test_prose_and_partial_matches_are_ignored():
+    body = ('<p>Update your preferences, delete your settings or lookup store hours.</p>'
+            '<script>function updateBanner(x){} var offset = "0"; notLookup("X")</script>'
+            '<a href="/v2/dataevents/key:Other">x</a>')
+    assert scan_content(body) == []
+
+
+def test_case_insensitive_with_non_ascii_text():
+    # 'İ'.lower() is two characters, so the prefilter falls back to a full scan
+    assert scan_content('İstanbul LOOKUP("Stores", "City", @c)') == [ContentRef('Stores', 'read', 'LOOKUP')]
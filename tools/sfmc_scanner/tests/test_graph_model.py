@@ -0,0 +1,32 @@
+import json
+
+from sfmc_scanner.graph_model import CompactGraph, NodeType, Relationship
+
+
+def sample_graph() -> CompactGraph:
+    g = CompactGraph()
+    g.add_node('de::Subs', NodeType.DATA_EXTENSION, 'Abonnés', externalKey='Subs',
+               metadata={'fields': [{'name': 'Email', 'type': 'EmailAddress'}]})
+    g.add_node('query::q1', NodeType.QUERY, 'Daily "extract"', sql='SELECT * FROM Subs')
+    g.add_node('automation::a1', 'Automation', None)
+    ev = ['query:q1 SQL FROM Subs']
+    g.add_edge('query::q1', 'de::Subs', Relationship.READS_FROM, ev, 0.6)
+    g.add_edge('query::q1', 'de::Out', 'writes_to', ev, 0.6)
+    g.add_edge('automation::a1', 'query::q1', Relationship.EXECUTES)
+    return g
+
+
+def test_write_json_matches_json_dump(tmp_path):
+    for g in (sample_graph(), CompactGraph()):
+        path = tmp_path / 'graph.json'
+        g.write_json(str(path))
+        assert path.read_text(encoding='utf-8') == json.dumps(g.to_dict(), ensure_ascii=False, indent=2)
+
+
+def test_from_dict_round_trips():
+    data = sample_graph().to_dict()
+    again = CompactGraph.from_dict(data)
+    assert again.to_dict() == data
+    # undeclared edge endpoints stay out of the node list
+    assert not again.has_node('de::Out')
+    assert again.node_count == 3 and again.edge_count == 3
@@ -0,0 +1,102 @@
+import random
+
+from sfmc_scanner.graph_model import CompactGraph
+from sfmc_scanner.pii_taint import EMAIL, PHONE, TaintPropagator
+
+RELATIONSHIPS = ['reads_from', 'writes_to', 'used_by', 'references', 'executes']
+
+
+def random_edges(rng, n, m):
+    return [(rng.randrange(n), rng.randrange(n), rng.choice(RELATIONSHIPS)) for _ in range(m)]
+
+
+def build(n, edges, order=None):
+    g = CompactGraph()
+    for i in order or range(n):
+        g.add_node(f'n{i}', 'Query')
+    for s, d, rel in edges:
+        g.add_edge(f'n{s}', f'n{d}', rel)
+    return g
+
+
+def fixpoint(t):
+    taint = list(t.seeds)
+    changed = True
+    while changed:
+        changed = False
+        for v in range(t.n):
+            mask = taint[v]
+            for p in t.predecessors(v):
+                mask |= taint[p]
+            if mask != taint[v]:
+                taint[v] = mask
+                changed = True
+    return taint
+
+
+def seeded(g, seeds):
+    t = TaintPropagator(g)
+    for node_id, mask in seeds.items():
+        t.set_seed(node_id, mask)
+    return t
+
+
+def test_full_propagation_matches_fixpoint():
+    rng = random.Random(1)
+    for _ in range(50):
+        g = build(30, random_edges(rng, 30, 60))
+        t = seeded(g, {f'n{i}': 1 << rng.randrange(3) for i in rng.sample(range(30), 4)})
+        t.propagate()
+        assert list(t.taint) == fixpoint(t)
+
+
+def test_self_loop_clears_stale_taint():
+    g = CompactGraph()
+    g.add_node('de::A', 'DataExtension', 'A')
+    g.add_node('query::q', 'Query', 'q')
+    g.add_edge('query::q', 'de::A', 'reads_from')
+    g.add_edge('query::q', 'query::q', 'writes_to')
+    t = seeded(g, {'de::A': EMAIL | PHONE})
+    t.propagate()
+    previous = t.state()
+
+    t2 = seeded(g, {'de::A': EMAIL})
+    t2.propagate_incremental(previous)
+    assert list(t2.taint) == [EMAIL, EMAIL]
+
+
+def test_incremental_matches_full_after_changes():
+    rng = random.Random(2)
+    for _ in range(100):
+        n, m = 25, 50
+        seeds = {f'n{i}': 1 << rng.randrange(3) for i in rng.sample(range(n), 4)}
+        edges = random_edges(rng, n, m)
+        base = build(n, edges)
+        t = seeded(base, seeds)
+        t.propagate()
+        previous = t.state()
+
+        # next scan: some seeds change, a few edges disappear and one appears
+        seeds2 = dict(seeds)
+        seeds2[f'n{rng.randrange(n)}'] = 1 << rng.randrange(3)
+        seeds2.pop(next(iter(seeds2)))
+        dropped = set(rng.sample(range(m), 3))
+        edges2 = [e for k, e in enumerate(edges) if k not in dropped] + random_edges(rng, n, 1)
+        # every other rescan interns nodes in a different order
+        order = rng.sample(range(n), n) if rng.random() < 0.5 else None
+        g2 = build(n, edges2, order)
+
+        incremental = seeded(g2, seeds2)
+        incremental.propagate_incremental(previous)
+        full = seeded(g2, seeds2)
+        full.propagate()
+        assert list(incremental.taint) == list(full.taint)
+        assert list(full.taint) == fixpoint(full)
+
+
+def test_unchanged_rescan_recomputes_nothing():
+    rng = random.Random(3)
+    g = build(40, random_edges(rng, 40, 80))
+    t = seeded(g, {'n0': EMAIL})
+    t.propagate()
+    assert seeded(g, {'n0': EMAIL}).propagate_incremental(t.state()) == 0
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from sfmc_scanner.response_archive import ResponseArchive, request_key
+
+
+def test_replay_requires_existing_archive(tmp_path):
+    missing = tmp_path / 'typo'
+    with pytest.raises(FileNotFoundError):
+        ResponseArchive(str(missing), 'replay')
+    assert not missing.exists()
+
+
+def test_record_then_replay(tmp_path):
+    root = str(tmp_path / 'archive')
+    key = request_key('POST', 'https://a.soap.example/Service.asmx', body=b'<fueloauth>tok1</fueloauth><x/>')
+    archive = ResponseArchive(root, 'record')
+    archive.record(key, 200, b'<ok/>')
+    archive.record(request_key('GET', 'https://a.rest.example/x'), 200, b'<ok/>')
+    archive.close()
+    assert len([f for f in os.listdir(root) if f.endswith('.seg')]) == 1
+
+    replay = ResponseArchive(root, 'replay')
+    # a different host and token map to the same recorded request
+    other = request_key('POST', 'https://b.soap.example/Service.asmx', body=b'<fueloauth>tok2</fueloauth><x/>')
+    resp = replay.lookup(other)
+    replay.close()
+    assert resp.status_code == 200 and resp.text == '<ok/>'
@@ -0,0 +1,157 @@
+from sfmc_scanner import sfmc_scanner
+from sfmc_scanner.graph_model import CompactGraph
+
+
+def fake_pages(monkeypatch, pages, count=None):
+    calls = []
+
+    def rest_get(path, token, rest_base, params=None):
+        calls.append(params['page'])
+        items = pages[params['page'] - 1] if params['page'] <= len(pages) else []
+        resp = {'items': items}
+        if count is not None:
+            resp['count'] = count
+        return resp
+
+    monkeypatch.setattr(sfmc_scanner, 'rest_get', rest_get)
+    return calls
+
+
+def test_iter_paged_continues_past_capped_page_size(monkeypatch):
+    # asked for 500, the API returns 50 per page
+    pages = [list(range(i, i + 50)) for i in range(0, 120, 50)]
+    pages[-1] = pages[-1][:20]
+    calls = fake_pages(monkeypatch, pages, count=120)
+    assert list(sfmc_scanner.iter_paged('/x', 't', 'https://rest')) == list(range(120))
+    assert calls == [1, 2, 3]
+
+
+def test_iter_paged_without_count_stops_on_empty_page(monkeypatch):
+    fake_pages(monkeypatch, [[1, 2], [3]])
+    assert list(sfmc_scanner.iter_paged('/x', 't', 'https://rest')) == [1, 2, 3]
+
+
+def test_cloudpage_detail_failure_keeps_scanning(monkeypatch):
+    page = {'id': 7, 'name': 'Landing', 'assetType': {'name': 'webpage'}}
+    email = {'id': 8, 'name': 'Mail', 'assetType': {'name': 'htmlemail'}, 'content': "Lookup('Stores', 'a', 1)"}
+
+    def iter_paged(path, token, rest_base, **kwargs):
+        return iter([page, email] if path.startswith('/asset') else [])
+
+    def rest_get(path, token, rest_base, params=None):
+        raise RuntimeError('timeout')
+
+    monkeypatch.setattr(sfmc_scanner, 'iter_paged', iter_paged)
+    monkeypatch.setattr(sfmc_scanner, 'rest_get', rest_get)
+    graph = CompactGraph()
+    sfmc_scanner.scan_content_assets(graph, 't', 'https://rest', {})
+    assert graph.has_node('cloudpage::7')
+    assert [e['to'] for e in graph.iter_edge_dicts()] == ['de::Stores']
+
+
+# -------------------------------
+# Automation details / enrichment
+# -------------------------------
+
+def fake_details(monkeypatch, details, fail=(), delay=0.0):
+    import threading
+    import time
+
+    state = {'calls': [], 'in_flight': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def rest_get(path, token, rest_base, params=None):
+        aid = path.rsplit('/', 1)[1]
+        with lock:
+            state['calls'].append(aid)
+            state['in_flight'] += 1
+            state['peak'] = max(state['peak'], state['in_flight'])
+        try:
+            time.sleep(delay)
+            if aid in fail:
+                raise RuntimeError('timeout')
+            return details.get(aid, {'_http_error': True, 'status_code': 404, 'text': ''})
+        finally:
+            with lock:
+                state['in_flight'] -= 1
+
+    monkeypatch.setattr(sfmc_scanner, 'rest_get', rest_get)
+    return state
+
+
+def test_automation_details_cache_by_modified_date(monkeypatch, tmp_path):
+    cache = str(tmp_path / 'automations.json')
+    listed = [{'id': 'a1', 'name': 'A1', 'modifiedDate': 'd1'}, {'id': 'a2', 'name': 'A2', 'modifiedDate': 'd1'}]
+    details = {aid: {'steps': [{'activities': [{'name': f'{aid}-act'}]}]} for aid in ('a1', 'a2')}
+    state = fake_details(monkeypatch, details)
+    out = sfmc_scanner.fetch_automation_details('t', 'https://rest', listed, cache)
+    assert sorted(state['calls']) == ['a1', 'a2']
+    assert out[0]['name'] == 'A1' and out[0]['steps'][0]['activities'][0]['name'] == 'a1-act'
+
+    # a2 changed since the last scan; a1 is served from the cache
+    state = fake_details(monkeypatch, details)
+    relisted = [dict(listed[0]), dict(listed[1], modifiedDate='d2')]
+    out = sfmc_scanner.fetch_automation_details('t', 'https://rest', relisted, cache)
+    assert state['calls'] == ['a2']
+    assert [a['steps'][0]['activities'][0]['name'] for a in out] == ['a1-act', 'a2-act']
+
+
+def test_automation_details_failures_are_skipped_and_not_cached(monkeypatch, tmp_path):
+    cache = str(tmp_path / 'automations.json')
+    listed = [{'id': 'ok', 'modifiedDate': 'd'}, {'id': 'boom', 'modifiedDate': 'd'},
+              {'id': 'gone', 'modifiedDate': 'd'}, {'id': 'inline', 'steps': [{'activities': []}]}]
+    fake_details(monkeypatch, {'ok': {'steps': []}}, fail={'boom'})
+    out = sfmc_scanner.fetch_automation_details('t', 'https://rest', listed, cache)
+    # failed and 404 details keep the list entry; automations that already carry steps are not fetched
+    assert out[1:] == listed[1:]
+
+    state = fake_details(monkeypatch, {})
+    sfmc_scanner.fetch_automation_details('t', 'https://rest', listed, cache)
+    assert sorted(state['calls']) == ['boom', 'gone']
+
+
+def test_automation_details_pool_is_bounded(monkeypatch):
+    listed = [{'id': f'a{i}'} for i in range(8)]
+    state = fake_details(monkeypatch, {f'a{i}': {'steps': []} for i in range(8)}, delay=0.02)
+    sfmc_scanner.fetch_automation_details('t', 'https://rest', listed, max_workers=3)
+    assert len(state['calls']) == 8
+    assert 1 < state['peak'] <= 3
+
+
+def edges_of(graph):
+    return {(e['from'], e['relationship'], e['to']) for e in graph.iter_edge_dicts()}
+
+
+def test_enrich_automations_resolves_queries_and_targets():
+    queries = [
+        {'queryDefinitionId': 'QD1', 'name': 'q1', 'DataExtensionTarget': {'CustomerKey': 'Daily'}},
+        {'id': 'QD2', 'key': 'q2-key', 'name': 'q2', 'targetKey': 'Weekly'},
+    ]
+    automation = {'id': 'A', 'name': 'Nightly', 'steps': [{'activities': [
+        {'name': 'by id', 'objectTypeId': 300, 'activityObjectId': 'qd1'},
+        {'name': 'by key', 'objectTypeId': 300, 'activityObjectId': 'Q2-KEY'},
+        {'name': 'import', 'objectTypeId': 43, 'activityObjectId': 'IMP1',
+         'targetDataExtensions': [{'key': 'Staging'}, {'customerKey': 'Staging'}, 'junk']},
+    ]}]}
+    graph = CompactGraph()
+    sfmc_scanner.enrich_automations(graph, [automation], queries)
+
+    assert edges_of(graph) == {
+        ('automation::A', 'executes', 'query::QD1'),
+        ('automation::A', 'writes_to', 'de::Daily'),
+        ('automation::A', 'executes', 'query::QD2'),
+        ('automation::A', 'writes_to', 'de::Weekly'),
+        ('automation::A', 'executes', 'import::IMP1'),
+        ('automation::A', 'writes_to', 'de::Staging'),
+    }
+    assert graph.edge_count == 6  # duplicate targets collapse to one edge
+    assert graph.node_dict(graph.ids.lookup('import::IMP1'))['type'] == 'Activity'
+
+
+def test_enrich_automations_unresolved_query_is_query_typed():
+    automation = {'id': 'A', 'activities': [{'name': 'missing', 'objectTypeId': '300', 'activityObjectId': 'Q9'}]}
+    graph = CompactGraph()
+    sfmc_scanner.enrich_automations(graph, [automation], [])
+    node = graph.node_dict(graph.ids.lookup('query::Q9'))
+    assert node['type'] == 'Query' and 'activityType' not in node
+    assert edges_of(graph) == {('automation::A', 'executes', 'query::Q9')}